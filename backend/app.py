@@ -12,11 +12,13 @@ import uuid as uuid_factory
 import zipfile
 from threading import Thread
 
-import polyline
 import requests
 from flask import Flask, request, send_file, redirect
 from flask_cors import CORS
 
+from automatic_walk_time_tables.geo_processing.elevation_providers import (
+    RemoteElevationProvider,
+)
 from automatic_walk_time_tables.path_transformers.douglas_peucker_transformer import (
     DouglasPeuckerTransformer,
 )
@@ -26,13 +28,29 @@ from automatic_walk_time_tables.path_transformers.equidistant_transfomer import
 from automatic_walk_time_tables.path_transformers.heigth_fetcher_transfomer import (
     HeightFetcherTransformer,
 )
+from automatic_walk_time_tables.path_transformers.pipeline import (
+    PipelineStage,
+    TransformerPipeline,
+)
 from automatic_walk_time_tables.path_transformers.pois_transfomer import POIsTransformer
+from automatic_walk_time_tables.path_transformers.simplification_transformer import (
+    SimplificationTransformer,
+)
+from automatic_walk_time_tables.path_transformers.transformer_cache import (
+    transformer_cache,
+)
+from automatic_walk_time_tables.utils import polyline_encoding
 from automatic_walk_time_tables.utils.error import UserException
 from automatic_walk_time_tables.utils.gpx_creator import (
     create_gpx_file,
     fetch_data_for_uuid,
 )
-from automatic_walk_time_tables.utils.path import Path, path_from_json
+from automatic_walk_time_tables.utils.name_cache import name_cache
+from automatic_walk_time_tables.utils.path import (
+    Path,
+    path_from_arrays,
+    path_from_json,
+)
 from automatic_walk_time_tables.utils.point import Point_LV95
 from automatic_walk_time_tables.utils.qr import build_qr_code_image_string
 from server_logging.log_helper import setup_recursive_logger
@@ -78,6 +96,12 @@ def parse_route():
         equidistant_transformer = EquidistantTransformer(equidistant_distance=10)
         path = equidistant_transformer.transform(path)
 
+        # optional, e.g. for previews: the simplified route is not precise enough for
+        # calculating the walk time table
+        simplification_transformer = SimplificationTransformer.from_options(options)
+        if simplification_transformer is not None:
+            path = simplification_transformer.transform(path)
+
         route = (
             path.to_polyline()
             if "encoding" in options and options["encoding"] == "polyline"
@@ -139,35 +163,38 @@ def create_walk_time_table():
             end = time.time()
             logger.info("Decoding polyline took {} seconds.".format(end - start))
 
-            start = time.time()
-
-            # calc POIs for the path
-            pois_transformer = POIsTransformer(
-                pois_list_as_str=options["pois"] if "pois" in options else "",
-                pois_distance_str=(
-                    options["pois_distance"] if "pois_distance" in options else ""
-                ),
-            )
-            pois: Path = pois_transformer.transform(path)
-
-            end = time.time()
-            logger.info("Calculating POIs took {} seconds.".format(end - start))
-            start = time.time()
-
-            douglas_peucker_transformer = DouglasPeuckerTransformer(
-                number_of_waypoints=21, pois=pois
-            )
+            stages = [
+                # calc POIs for the path
+                PipelineStage(
+                    "pois",
+                    POIsTransformer(
+                        pois_list_as_str=options["pois"] if "pois" in options else "",
+                        pois_distance_str=(
+                            options["pois_distance"]
+                            if "pois_distance" in options
+                            else ""
+                        ),
+                    ),
+                )
+            ]
 
             # we don't use the auto waypoints if the user has disabled them
             if options["auto_waypoints"]:
-                selected_way_points = douglas_peucker_transformer.transform(path)
-            else:
-                selected_way_points = pois
-
-            end = time.time()
-            logger.info(
-                "Calculating Douglas-Peucker took {} seconds.".format(end - start)
-            )
+                stages.append(
+                    PipelineStage(
+                        "way_points",
+                        lambda pois: DouglasPeuckerTransformer(
+                            number_of_waypoints=21, pois=pois
+                        ),
+                        inputs=("pois",),
+                    )
+                )
+
+            pipeline = TransformerPipeline(stages, name="create-walk-time-table")
+            values = pipeline.run(path=path)
+
+            pois: Path = values["pois"]
+            selected_way_points = values.get("way_points", pois)
 
             result_json = {
                 "status": GeneratorStatus.SUCCESS,
@@ -211,21 +238,26 @@ def create_walk_time_table():
 
 
 def extract_path(options, coords_field="route", elevation_field="elevation_data"):
-    path = Path(
-        list(
-            map(
-                lambda pkt: Point_LV95(lat=pkt[0], lon=pkt[1]),
-                polyline.decode(options[coords_field], 0),
-            )
-        )
-    )
+    eastings, northings = polyline_encoding.decode(options[coords_field], 0)
+
     if elevation_field in options:
-        elevation_data = polyline.decode(options[elevation_field], 0)
-        for i, way_point in enumerate(path.way_points):
-            way_point.point.h = elevation_data[i][1]
-            way_point.accumulated_distance = elevation_data[i][0]
+        # the elevation profile already contains the accumulated distances,
+        # thus we can load the columns directly (LV95 to LV03 is a constant offset)
+        distances, heights = polyline_encoding.decode(options[elevation_field], 0)
+        path = path_from_arrays(
+            eastings=eastings - 2_000_000,
+            northings=northings - 1_000_000,
+            heights=heights[: len(eastings)],
+            accumulated_distances=distances[: len(eastings)],
+        )
 
     else:
+        path = Path(
+            [
+                Point_LV95(lat=lat, lon=lon)
+                for lat, lon in zip(eastings.tolist(), northings.tolist())
+            ]
+        )
         height_fetcher_transformer = HeightFetcherTransformer()
         path = height_fetcher_transformer.transform(path)
 
@@ -277,18 +309,30 @@ def create_export(options, uuid):
             path = extract_path(options, "route", "route_elevation")
             way_points = extract_path(options, "way_points", "way_points_elevation")
 
-            # calc POIs for the path
-            pois_transformer = POIsTransformer(
-                pois_list_as_str=options["pois"] if "pois" in options else "",
-                pois_distance_str=(
-                    options["pois_distance"] if "pois_distance" in options else ""
-                ),
-            )
-            pois: Path = pois_transformer.transform(path)
-
             end = time.time()
             logger.info("Decoding polylines took {} seconds.".format(end - start))
 
+            # calc POIs for the path
+            pipeline = TransformerPipeline(
+                [
+                    PipelineStage(
+                        "pois",
+                        POIsTransformer(
+                            pois_list_as_str=(
+                                options["pois"] if "pois" in options else ""
+                            ),
+                            pois_distance_str=(
+                                options["pois_distance"]
+                                if "pois_distance" in options
+                                else ""
+                            ),
+                        ),
+                    )
+                ],
+                name="create-export",
+            )
+            pois: Path = pipeline.run(path=path)["pois"]
+
         output_directory = "output/" + uuid + "/"
 
         logger.log(
@@ -372,6 +416,21 @@ def __delete_after_delay(base_path: str, uuid: str, delay=720):
     logger.info("Deleted folder %s" % base_path)
 
 
+@app.route("/cache_stats")
+def cache_stats():
+    return app.response_class(
+        response=json.dumps(
+            {
+                "transformer_cache": transformer_cache.stats(),
+                "name_cache": name_cache.stats(),
+                "elevation_cache": RemoteElevationProvider.cache_stats(),
+            }
+        ),
+        status=200,
+        mimetype="application/json",
+    )
+
+
 @app.route("/download/<uuid>")
 def download(uuid):
     # Check if export is completed and still present in the 'output' folder
@@ -12,13 +12,17 @@ from automatic_walk_time_tables.map_downloader.create_map import MapCreator
 from automatic_walk_time_tables.path_transformers.douglas_peucker_transformer import (
     DouglasPeuckerTransformer,
 )
-from automatic_walk_time_tables.path_transformers.equidistant_transfomer import (
-    EquidistantTransformer,
-)
 from automatic_walk_time_tables.path_transformers.naming_transformer import (
     NamingTransformer,
 )
+from automatic_walk_time_tables.path_transformers.pipeline import (
+    PipelineStage,
+    TransformerPipeline,
+)
 from automatic_walk_time_tables.path_transformers.pois_transfomer import POIsTransformer
+from automatic_walk_time_tables.path_transformers.simplification_transformer import (
+    SimplificationTransformer,
+)
 from automatic_walk_time_tables.utils import path
 from automatic_walk_time_tables.utils import gpx_creator
 from automatic_walk_time_tables.utils.file_parser import GeoFileParser
@@ -31,6 +35,9 @@ from automatic_walk_time_tables.utils.error import UserException
 
 
 class AutomatedWalkTableGenerator:
+    status_output_size = 2_000
+    """ default size (in pixels) to which the route in the status message is simplified """
+
     def __init__(self, uuid: str, options: dict):
         self.__path: path.Path | None = None
         self.__pois: path.Path | None = None
@@ -87,30 +94,48 @@ class AutomatedWalkTableGenerator:
         if "is-retrieve" in self.options.keys():
             pass
         else:
-            # calc POIs for the path
-            if self.__pois is None:
-                pois_transformer = POIsTransformer(
-                    self.options["settings"]["list_of_pois"]
-                )
-                self.__pois: path.Path = pois_transformer.transform(self.__path)
+            pipeline = TransformerPipeline(
+                [
+                    # calc POIs for the path
+                    PipelineStage(
+                        "pois",
+                        POIsTransformer(self.options["settings"]["list_of_pois"]),
+                        keep_provided=True,
+                    ),
+                    # calc points for walk-time table
+                    PipelineStage(
+                        "way_points",
+                        lambda pois: DouglasPeuckerTransformer(
+                            number_of_waypoints=21, pois=pois
+                        ),
+                        inputs=("pois",),
+                        keep_provided=True,
+                    ),
+                    PipelineStage(
+                        "names",
+                        NamingTransformer(),
+                        source="way_points",
+                        output="way_points",
+                    ),
+                ],
+                name="export",
+            )
+            values = pipeline.run(
+                path=self.__path, pois=self.__pois, way_points=self.__way_points
+            )
+            self.__pois = values["pois"]
+            self.__way_points = values["way_points"]
 
-            # calc points for walk-time table
-            if self.__way_points is None:
-                douglas_peucker_transformer = DouglasPeuckerTransformer(
-                    number_of_waypoints=21, pois=self.__pois
-                )
-                self.__way_points: path.Path = self.__log_runtime(
-                    douglas_peucker_transformer.transform,
+            douglas_peucker_metrics = pipeline.get_metrics("way_points")
+            if douglas_peucker_metrics.skipped is None:
+                self.__log_duration(
                     "Benötigte Zeit zum Berechnen der Marschzeittabelle",
-                    self.__path,
+                    douglas_peucker_metrics.wall_time,
                 )
 
-            naming_fetcher = NamingTransformer()
-            self.__way_points = naming_fetcher.transform(self.__way_points)
-
-        equidistant_transformer = EquidistantTransformer(equidistant_distance=1)
-        equidistant_way_points: path.Path = equidistant_transformer.transform(
-            self.__path
+        # the route is only displayed, thus it can be simplified to the size of the map
+        simplification_transformer = SimplificationTransformer.from_options(
+            self.options, output_size=self.status_output_size
         )
 
         self.__logger.log(
@@ -119,7 +144,9 @@ class AutomatedWalkTableGenerator:
             {
                 "uuid": self.uuid,
                 "status": GeneratorStatus.RUNNING,
-                "route": equidistant_way_points.to_polyline(),
+                "route": simplification_transformer.transform(
+                    self.__path
+                ).to_polyline(),
             },
         )
 
@@ -218,12 +245,15 @@ class AutomatedWalkTableGenerator:
         """
         start = time.time()
         results = function(*args, **kwargs)
+        self.__log_duration(log_string, time.time() - start)
+        return results
+
+    def __log_duration(self, log_string: str, duration: float):
         self.__logger.log(
             ExportStateLogger.REQUESTABLE,
-            log_string + ": %ss" % round((time.time() - start), 2),
+            log_string + ": %ss" % round(duration, 2),
             {"uuid": self.uuid, "status": GeneratorStatus.RUNNING},
         )
-        return results
 
     def set_data(self, path_data: path.Path, way_points: path.Path, pois: path.Path):
         self.__logger.debug("Setting data for the generator.")
@@ -244,7 +274,7 @@ class AutomatedWalkTableGenerator:
         return {
             "uuid": self.uuid,
             "options": self.options,
-            "path": self.__path.to_json(),
-            "pois": self.__pois.to_json(),
-            "way_points": self.__way_points.to_json(),
+            "path": self.__path.to_binary_json(),
+            "pois": self.__pois.to_binary_json(),
+            "way_points": self.__way_points.to_binary_json(),
         }
@@ -37,6 +37,8 @@
 
 import math
 
+import numpy as np
+
 
 class GPSConverter(object):
     """
@@ -182,6 +184,118 @@ class GPSConverter(object):
         return d
 
 
+# Vectorized variants of the conversions above. They accept (and return) NumPy arrays,
+# such that a whole route can be converted at once. The formulas are evaluated in exactly
+# the same order as in GPSConverter, thus the results match the scalar implementation.
+
+
+def _dec_to_seconds_array(dec):
+    """Convert decimal angles (° dec) to seconds, see DecToSexAngle and SexAngleToSeconds"""
+    degree = np.floor(dec)
+    minute = np.floor((dec - degree) * 60)
+    second = (((dec - degree) * 60) - minute) * 60
+    dms = degree + (minute / 100) + (second / 10000)
+
+    degree = np.floor(dms)
+    minute = np.floor((dms - degree) * 100)
+    second = (((dms - degree) * 100) - minute) * 100
+    return second + (minute * 60) + (degree * 3600)
+
+
+def WGS84toLV03_array(latitudes, longitudes, heights):
+    """
+    Convert arrays of WGS84 coordinates to LV03. Returns a tuple of arrays
+    containing east, north, and height (the height is passed through unchanged,
+    as in GPSConverter.WGS84toLV03).
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+
+    # Axiliary values (% Bern)
+    lat_aux = (_dec_to_seconds_array(latitudes) - 169028.66) / 10000
+    lng_aux = (_dec_to_seconds_array(longitudes) - 26782.5) / 10000
+
+    east = (
+        (600072.37 + (211455.93 * lng_aux))
+        + -(10938.51 * lng_aux * lat_aux)
+        + -(0.36 * lng_aux * lat_aux**2)
+        + -(44.54 * lng_aux**3)
+    )
+    north = (
+        (
+            200147.07
+            + (308807.95 * lat_aux)
+            + +(3745.25 * lng_aux**2)
+            + +(76.63 * lat_aux**2)
+        )
+        + -(194.56 * lng_aux**2 * lat_aux)
+    ) + +(119.79 * lat_aux**3)
+
+    return east, north, np.array(heights, dtype=np.float64)
+
+
+def LV03toWGS84_array(east, north, heights):
+    """
+    Convert arrays of LV03 coordinates to WGS84. Returns a tuple of arrays
+    containing latitude, longitude, and height.
+    """
+    east = np.asarray(east, dtype=np.float64)
+    north = np.asarray(north, dtype=np.float64)
+
+    # Axiliary values (% Bern)
+    y_aux = (east - 600000) / 1000000
+    x_aux = (north - 200000) / 1000000
+
+    lat = (
+        (16.9023892 + (3.238272 * x_aux))
+        + -(0.270978 * y_aux**2)
+        + -(0.002528 * x_aux**2)
+        + -(0.0447 * y_aux**2 * x_aux)
+        + -(0.0140 * x_aux**3)
+    )
+    lng = (
+        2.6779094
+        + (4.728982 * y_aux)
+        + +(0.791484 * y_aux * x_aux)
+        + +(0.1306 * y_aux * x_aux**2)
+    ) + -(0.0436 * y_aux**3)
+    height = (
+        (np.asarray(heights, dtype=np.float64) + 49.55)
+        - (12.60 * y_aux)
+        - (22.64 * x_aux)
+    )
+
+    # Unit 10000" to 1" and convert seconds to degrees (dec)
+    return (lat * 100) / 36, (lng * 100) / 36, height
+
+
+def LV95toLV03_array(east, north):
+    """Convert arrays of LV95 coordinates to LV03 (returns east and north)"""
+    return (
+        np.asarray(east, dtype=np.float64) - 2_000_000,
+        np.asarray(north, dtype=np.float64) - 1_000_000,
+    )
+
+
+def LV03toLV95_array(east, north):
+    """Convert arrays of LV03 coordinates to LV95 (returns east and north)"""
+    return (
+        np.asarray(east, dtype=np.float64) + 2_000_000,
+        np.asarray(north, dtype=np.float64) + 1_000_000,
+    )
+
+
+def WGS84toLV95_array(latitudes, longitudes, heights):
+    """Convert arrays of WGS84 coordinates to LV95 (returns east, north, and height)"""
+    east, north, heights = WGS84toLV03_array(latitudes, longitudes, heights)
+    return *LV03toLV95_array(east, north), heights
+
+
+def LV95toWGS84_array(east, north, heights):
+    """Convert arrays of LV95 coordinates to WGS84 (returns lat, long, and height)"""
+    return LV03toWGS84_array(*LV95toLV03_array(east, north), heights)
+
+
 if __name__ == "__main__":
     """Example usage for the GPSConverter class."""
 
@@ -0,0 +1,389 @@
+"""
+
+Elevation providers used by the HeightFetcherTransformer.
+
+A provider returns the elevation profile of a line given by its LV03 vertices: the vertices
+plus additional points in between (at least min_number_of_points in total) with their heights.
+
+- RemoteElevationProvider: the profile API of swisstopo (api3.geo.admin.ch)
+- LocalDEMElevationProvider: a locally stored, memory-mapped elevation raster
+- FallbackElevationProvider: uses the first of several providers that covers the line
+
+The provider used by default is configured by the environment (see default_elevation_provider).
+
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+from automatic_walk_time_tables.utils.point import PointType
+
+logger = logging.getLogger(__name__)
+
+Profile = Tuple[np.ndarray, np.ndarray, np.ndarray]
+""" LV03 eastings, northings and heights of the points of a profile """
+
+# shared by all remote providers, keeps the connections to the profile API alive
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_maxsize=16))
+_session.mount("http://", HTTPAdapter(pool_maxsize=16))
+
+
+class ElevationProvider:
+    def profile(
+        self, eastings: np.ndarray, northings: np.ndarray, min_number_of_points: int
+    ) -> Profile:
+        raise Exception("Not implemented!")
+
+
+class RemoteElevationProvider(ElevationProvider):
+    """
+
+    Fetches the profile from the profile API of swisstopo.
+
+    The line is split into chunks of at most chunk_size vertices, consecutive chunks overlap by
+    one vertex. The profiles of the chunks are fetched concurrently and stitched together, thus
+    there is no limit on the number of vertices. The min_number_of_points are distributed to
+    the chunks proportionally to their length. The profiles of the chunks are cached (see
+    _fetch_profile), such that fetching the same line again does not send any request.
+
+    """
+
+    PATH_URL = os.environ.get(
+        "PROFILE_API_URL", "https://api3.geo.admin.ch/rest/services/profile.json"
+    )
+
+    chunk_size = 1000  # the profile API accepts at most 5000 points per request
+    max_workers = 4
+
+    def __init__(self, url: str | None = None) -> None:
+        self.url = url if url is not None else self.PATH_URL
+
+    def profile(
+        self, eastings: np.ndarray, northings: np.ndarray, min_number_of_points: int
+    ) -> Profile:
+        # the profile API works with rounded coordinates
+        coordinates = list(
+            zip(
+                np.round(eastings).astype(np.int64).tolist(),
+                np.round(northings).astype(np.int64).tolist(),
+            )
+        )
+
+        chunks = self.split(coordinates, min_number_of_points)
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(self.max_workers, len(chunks)))
+        ) as executor:
+            profiles = list(
+                executor.map(
+                    lambda chunk: _fetch_profile(self.url, *chunk),
+                    chunks,
+                )
+            )
+
+        logger.debug(
+            "Fetched elevation for %d path parts, cache: %s",
+            len(chunks),
+            _fetch_profile.cache_info(),
+        )
+
+        return self.stitch(profiles)
+
+    def split(
+        self, coordinates: List[Tuple[int, int]], min_number_of_points: int
+    ) -> List[Tuple[Tuple[Tuple[int, int], ...], int]]:
+        """
+
+        Splits the coordinates into overlapping chunks and returns the coordinates and the number
+        of points to request (nb_points of the profile API) for each chunk.
+
+        """
+
+        if len(coordinates) <= self.chunk_size:
+            return [
+                (
+                    tuple(coordinates),
+                    max(len(coordinates), min_number_of_points),
+                )
+            ]
+
+        bounds = []
+        start = 0
+        while start < len(coordinates) - 1:
+            end = min(start + self.chunk_size, len(coordinates))
+            bounds.append((start, end))
+            start = end - 1
+
+        xs, ys = np.asarray(coordinates, dtype=np.float64).T
+        accumulated_lengths = np.concatenate(
+            ([0.0], np.cumsum(np.hypot(np.diff(xs), np.diff(ys))))
+        )
+        total_length = accumulated_lengths[-1]
+
+        chunks = []
+        for start, end in bounds:
+            if total_length > 0:
+                share = (
+                    accumulated_lengths[end - 1] - accumulated_lengths[start]
+                ) / total_length
+            else:
+                share = 1 / len(bounds)
+
+            number_of_points = max(end - start, math.ceil(min_number_of_points * share))
+            chunks.append((tuple(coordinates[start:end]), number_of_points))
+
+        return chunks
+
+    @staticmethod
+    def stitch(profiles: List[Profile]) -> Profile:
+        """
+        Concatenates the profiles of consecutive chunks, the shared vertices are only kept once.
+        """
+
+        columns = ([], [], [])
+
+        for eastings, northings, heights in profiles:
+            if (
+                len(columns[0]) > 0
+                and len(eastings) > 0
+                and eastings[0] == columns[0][-1][-1]
+                and northings[0] == columns[1][-1][-1]
+            ):
+                eastings, northings, heights = eastings[1:], northings[1:], heights[1:]
+
+            for column, values in zip(columns, (eastings, northings, heights)):
+                column.append(values)
+
+        if len(columns[0]) == 0:
+            return np.empty(0), np.empty(0), np.empty(0)
+
+        return tuple(np.concatenate(column) for column in columns)
+
+    @staticmethod
+    def cache_stats():
+        """
+        Returns the counters of the profile cache as a dict (JSON serializable), e.g. for monitoring.
+        """
+
+        info = _fetch_profile.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": info.hits / lookups if lookups > 0 else 0.0,
+            "entries": info.currsize,
+            "max_entries": info.maxsize,
+        }
+
+
+@functools.lru_cache(maxsize=int(os.environ.get("PROFILE_CACHE_MAX_ENTRIES", 512)))
+def _fetch_profile(
+    url: str, coordinates: Tuple[Tuple[int, int], ...], number_of_points: int
+) -> Profile:
+    """
+
+    Fetches the profile of a line from the profile API. The results are cached by the hash
+    of the (immutable) arguments, the returned arrays are read-only.
+
+    """
+
+    params = {
+        "nb_points": number_of_points,
+        "distinct_points": True,
+        "smart_filling": True,
+        "sr": PointType.LV03,
+    }
+    r = _session.post(
+        url,
+        json={"type": "LineString", "coordinates": [list(c) for c in coordinates]},
+        params=params,
+        timeout=60,
+    )
+
+    logger.info(r.url)
+
+    logger.debug("Fetched elevation for path part and got " + str(r.status_code))
+
+    if r.status_code not in (200, 203):
+        logger.debug("Status Code: " + str(r.status_code))
+        logger.debug("Response: " + r.text)
+        raise Exception("Failed to fetch elevation for path")
+
+    profile = r.json()
+    columns = (
+        np.array([entry["easting"] for entry in profile], dtype=np.float64),
+        np.array([entry["northing"] for entry in profile], dtype=np.float64),
+        np.array([float(entry["alts"]["COMB"]) for entry in profile], dtype=np.float64),
+    )
+
+    for column in columns:
+        column.setflags(write=False)
+
+    return columns
+
+
+class LocalDEMElevationProvider(ElevationProvider):
+    """
+
+    Samples the heights from a digital elevation model (DEM) stored as raw grid in LV95, e.g.
+    an export of swissALTI3D or DHM25. The grid is described by a JSON header:
+
+        {
+            "data": "dem.bin",      # raw grid, row by row from north to south (relative to the header)
+            "dtype": "<f4",         # numpy dtype of the cells
+            "width": 4800,          # number of columns
+            "height": 3200,         # number of rows
+            "x_min": 2480000.0,     # LV95 easting of the center of the north-west cell
+            "y_max": 1300000.0,     # LV95 northing of the center of the north-west cell
+            "cell_size": 25.0,      # in meters
+            "nodata": -9999.0       # optional
+        }
+
+    The grid is memory-mapped, thus only the cells around the sampled points are read from the
+    disk. Heights are interpolated bilinearly between the four surrounding cell centers.
+
+    Like the profile API, the profile contains all vertices of the line plus evenly distributed
+    points in between, such that it contains about min_number_of_points points (coinciding
+    points are only kept once). A ValueError is raised if the line is not fully covered by the
+    DEM (e.g. to fall back to the profile API).
+
+    """
+
+    def __init__(self, header_path: str) -> None:
+        with open(header_path) as header_file:
+            header = json.load(header_file)
+
+        self.width = int(header["width"])
+        self.height = int(header["height"])
+        self.x_min = float(header["x_min"])
+        self.y_max = float(header["y_max"])
+        self.cell_size = float(header["cell_size"])
+        self.nodata = header.get("nodata")
+
+        self.grid = np.memmap(
+            os.path.join(os.path.dirname(header_path), header["data"]),
+            dtype=np.dtype(header.get("dtype", "<f4")),
+            mode="r",
+            shape=(self.height, self.width),
+        )
+
+    def sample(self, eastings: np.ndarray, northings: np.ndarray) -> np.ndarray:
+        """
+        Returns the heights at the given LV03 coordinates, NaN if a point is not covered by the DEM.
+        """
+
+        columns = (np.asarray(eastings) + 2_000_000 - self.x_min) / self.cell_size
+        rows = (self.y_max - (np.asarray(northings) + 1_000_000)) / self.cell_size
+
+        covered = (
+            (columns >= 0)
+            & (columns <= self.width - 1)
+            & (rows >= 0)
+            & (rows <= self.height - 1)
+        )
+        columns = np.where(covered, columns, 0.0)
+        rows = np.where(covered, rows, 0.0)
+
+        # the upper left cell of the four surrounding cells, the last column (row) is handled
+        # as the interpolation between the second to last and the last column (row)
+        left = np.minimum(np.floor(columns).astype(np.int64), max(self.width - 2, 0))
+        top = np.minimum(np.floor(rows).astype(np.int64), max(self.height - 2, 0))
+        right = np.minimum(left + 1, self.width - 1)
+        bottom = np.minimum(top + 1, self.height - 1)
+        dx = columns - left
+        dy = rows - top
+
+        corners = [
+            self.grid[top, left],
+            self.grid[top, right],
+            self.grid[bottom, left],
+            self.grid[bottom, right],
+        ]
+        corners = [np.asarray(corner, dtype=np.float64) for corner in corners]
+
+        if self.nodata is not None:
+            for corner in corners:
+                covered &= corner != self.nodata
+
+        heights = (1 - dy) * ((1 - dx) * corners[0] + dx * corners[1]) + dy * (
+            (1 - dx) * corners[2] + dx * corners[3]
+        )
+        return np.where(covered, heights, np.nan)
+
+    def profile(
+        self, eastings: np.ndarray, northings: np.ndarray, min_number_of_points: int
+    ) -> Profile:
+        eastings = np.asarray(eastings, dtype=np.float64)
+        northings = np.asarray(northings, dtype=np.float64)
+
+        lengths = np.concatenate(
+            ([0.0], np.cumsum(np.hypot(np.diff(eastings), np.diff(northings))))
+        )
+        if len(lengths) > 1 and min_number_of_points > len(lengths):
+            fill = np.linspace(0, lengths[-1], min_number_of_points - len(lengths) + 2)
+            positions = np.union1d(lengths, fill[1:-1])
+
+            # np.interp needs increasing positions, duplicated vertices are kept once
+            distinct = np.concatenate(([True], np.diff(lengths) > 0))
+            eastings = np.interp(positions, lengths[distinct], eastings[distinct])
+            northings = np.interp(positions, lengths[distinct], northings[distinct])
+
+        heights = self.sample(eastings, northings)
+        if np.any(np.isnan(heights)):
+            raise ValueError("The path is not fully covered by the local DEM.")
+
+        return eastings, northings, heights
+
+
+class FallbackElevationProvider(ElevationProvider):
+    """
+    Returns the profile of the first provider that does not fail.
+    """
+
+    def __init__(self, providers: List[ElevationProvider]) -> None:
+        self.providers = providers
+
+    def profile(
+        self, eastings: np.ndarray, northings: np.ndarray, min_number_of_points: int
+    ) -> Profile:
+        for provider in self.providers[:-1]:
+            try:
+                return provider.profile(eastings, northings, min_number_of_points)
+            except Exception as e:
+                logger.info(
+                    "%s failed (%s), falling back to the next elevation provider",
+                    type(provider).__name__,
+                    e,
+                )
+
+        return self.providers[-1].profile(eastings, northings, min_number_of_points)
+
+
+@functools.lru_cache(maxsize=None)
+def default_elevation_provider() -> ElevationProvider:
+    """
+
+    Returns the local DEM (with the profile API as fallback) if DEM_HEADER_PATH is set,
+    otherwise the profile API.
+
+    """
+
+    header_path = os.environ.get("DEM_HEADER_PATH")
+    if header_path is None:
+        return RemoteElevationProvider()
+
+    logger.info("Using the local DEM %s", header_path)
+    return FallbackElevationProvider(
+        [LocalDEMElevationProvider(header_path), RemoteElevationProvider()]
+    )
@@ -2,14 +2,16 @@ from __future__ import annotations
 
 import logging
 import math
-from typing import List
+from typing import List, Tuple
 
 import numpy as np
 
 from automatic_walk_time_tables.path_transformers.path_transfomer import PathTransformer
 from automatic_walk_time_tables.utils.geometry_utils import (
-    calc_secant_line,
+    calc_close_pairs,
+    calc_secant_deviations,
     calc_secant_elevation,
+    calc_secant_line,
 )
 from automatic_walk_time_tables.utils.path import Path
 from automatic_walk_time_tables.utils.way_point import WayPoint
@@ -45,11 +47,35 @@ class DouglasPeuckerTransformer(PathTransformer):
         self.number_of_waypoints = number_of_waypoints
         self.__logger = logging.getLogger(__name__)
 
+        # number of points returned by range queries (see points_between), for instrumentation
+        self.examined_points = 0
+
         if pois is None:
             pois = Path(points=[])
 
         self.pois = pois
 
+    @property
+    def pois(self) -> Path:
+        return self.__pois
+
+    @pois.setter
+    def pois(self, pois: Path) -> None:
+        """
+
+        Sets the POIs. Assign the POIs again after modifying them in place, such that
+        the identity set used for the membership tests is rebuilt.
+
+        """
+
+        self.__pois = pois
+
+        # WayPoint compares by identity, thus the set contains exactly the POI objects
+        self.__poi_set = set(pois.way_points)
+
+    def cache_parameters(self):
+        return [self.pois.fingerprint(), self.number_of_waypoints]
+
     def transform(self, path: Path) -> Path:
         way_points = self.douglas_peucker(path.copy())
         self.__logger.debug(
@@ -61,6 +87,7 @@ class DouglasPeuckerTransformer(PathTransformer):
         way_points = self.replace_with_close_by_pois(way_points, path)
         way_points = self.add_pois(way_points)
 
+        self.__logger.debug("%d points examined by range queries", self.examined_points)
         return way_points
 
     def add_pois(self, way_points: Path) -> Path:
@@ -98,6 +125,8 @@ class DouglasPeuckerTransformer(PathTransformer):
         """
 
         pois = self.pois.copy()
+        original_distances = original_waypoints.accumulated_distances
+        original_heights = original_waypoints.heights
 
         final_way_points = Path()
 
@@ -107,11 +136,13 @@ class DouglasPeuckerTransformer(PathTransformer):
                 final_way_points.append(p)
                 continue
 
+            # all POIs have been used up (or there are none)
+            if pois.number_of_waypoints == 0:
+                final_way_points.append(p)
+                continue
+
             # find closest poi
-            closest_poi = min(
-                pois.way_points,
-                key=lambda poi: abs(poi.accumulated_distance - p.accumulated_distance),
-            )
+            closest_poi = pois.get_closest_point_by_distance(p.accumulated_distance)
 
             # check if poi is nearer to p rather than to way_points.way_points[i + 1]
             if abs(closest_poi.accumulated_distance - p.accumulated_distance) >= abs(
@@ -137,20 +168,32 @@ class DouglasPeuckerTransformer(PathTransformer):
             m, b = calc_secant_line(way_points.way_points[i - 1], closest_poi)
             original_m, original_b = calc_secant_line(way_points.way_points[i - 1], p)
 
-            points_between_poi = self.points_between(
-                way_points.way_points[i - 1], closest_poi, original_waypoints.way_points
+            start, end = self.index_range_between(
+                way_points.way_points[i - 1], closest_poi, original_waypoints
             )
             can_replace = self.check_poi_replacement(
-                b, can_replace, m, original_b, original_m, points_between_poi
+                b,
+                can_replace,
+                m,
+                original_b,
+                original_m,
+                original_distances[start:end],
+                original_heights[start:end],
             )
 
             # Check points after the poi
             m, b = calc_secant_line(closest_poi, way_points.way_points[i + 1])
-            points_between_poi = self.points_between(
-                closest_poi, way_points.way_points[i + 1], original_waypoints.way_points
+            start, end = self.index_range_between(
+                closest_poi, way_points.way_points[i + 1], original_waypoints
             )
             can_replace = self.check_poi_replacement(
-                b, can_replace, m, original_b, original_m, points_between_poi
+                b,
+                can_replace,
+                m,
+                original_b,
+                original_m,
+                original_distances[start:end],
+                original_heights[start:end],
             )
 
             if can_replace:
@@ -180,24 +223,25 @@ class DouglasPeuckerTransformer(PathTransformer):
         return final_way_points
 
     def check_poi_replacement(
-        self, b, can_replace, m, original_b, original_m, points_between_poi
+        self, b, can_replace, m, original_b, original_m, distances, heights
     ):
-        for original_point in points_between_poi:
-            secant_elev = calc_secant_elevation(m, b, original_point)
-            original_elev = calc_secant_elevation(
-                original_m, original_b, original_point
-            )
+        """
 
-            offset = abs(secant_elev - original_point.point.h)
-            original_offset = abs(original_elev - original_point.point.h)
+        Checks for the original points (given by their distances and heights) whether
+        the secant line m, b is close enough to the original secant line.
 
-            can_replace &= (
-                offset < self.maximum_poi_error or offset <= original_offset + 20
-            )
+        """
+
+        offset = calc_secant_deviations(m, b, distances, heights)
+        original_offset = calc_secant_deviations(
+            original_m, original_b, distances, heights
+        )
 
-        return can_replace
+        return can_replace & bool(
+            np.all((offset < self.maximum_poi_error) | (offset <= original_offset + 20))
+        )
 
-    def douglas_peucker(self, way_points: Path):
+    def douglas_peucker(self, way_points: Path) -> Path:
         """
 
         Final selection: Iteratively reduce the number of points to the maximum specified in walk_point_limit. To
@@ -272,7 +316,7 @@ class DouglasPeuckerTransformer(PathTransformer):
             if pt_b == pt_c:
                 continue
 
-            if pt_b in self.pois.way_points and keep_pois:
+            if keep_pois and pt_b in self.__poi_set:
                 continue
 
             if pt_a is not None and pt_b is not None:
@@ -282,19 +326,21 @@ class DouglasPeuckerTransformer(PathTransformer):
                 if abs(secant_elev - pt_b.point.h) < drv_limit:
                     # Check if B must be replaced by a previously dropped point D
                     pt_d = None
-                    for pt in self.points_between(pt_a, pt_c, pts_dropped.way_points):
-                        secant_elev = calc_secant_elevation(m, b, pt)
-                        if abs(secant_elev - pt.point.h) >= drv_limit:
-                            pt_d = pt
-                            break
+                    candidates = self.points_between(pt_a, pt_c, pts_dropped)
+                    if len(candidates) > 0:
+                        deviations = calc_secant_deviations(
+                            m,
+                            b,
+                            [pt.accumulated_distance for pt in candidates],
+                            [pt.point.h for pt in candidates],
+                        )
+                        exceeding = np.flatnonzero(deviations >= drv_limit)
+                        if len(exceeding) > 0:
+                            pt_d = candidates[exceeding[0]]
 
                     if pt_d is not None:  # Replace B with point D
                         way_points.remove(pt_b)
-                        index = next(
-                            x
-                            for x, val in enumerate(way_points.way_points)
-                            if val.accumulated_distance > pt_d.accumulated_distance
-                        )
+                        index = way_points.bisect_right(pt_d.accumulated_distance)
                         way_points.insert(pt_d, index)
                         pts_dropped.insert(pt_b)
 
@@ -311,21 +357,31 @@ class DouglasPeuckerTransformer(PathTransformer):
         return pt_dropped
 
     def points_between(
-        self, pt_start: WayPoint, pt_end: WayPoint, original_waypoints: List[WayPoint]
+        self, pt_start: WayPoint, pt_end: WayPoint, original_waypoints: Path
     ) -> List[WayPoint]:
         """
 
         Returns all way points between to way points.
 
         """
-        return list(
-            filter(
-                lambda p: pt_start.accumulated_distance
-                < p.accumulated_distance
-                < pt_end.accumulated_distance,
-                original_waypoints,
-            )
+
+        start, end = self.index_range_between(pt_start, pt_end, original_waypoints)
+        return original_waypoints.way_points[start:end]
+
+    def index_range_between(
+        self, pt_start: WayPoint, pt_end: WayPoint, original_waypoints: Path
+    ) -> Tuple[int, int]:
+        """
+
+        Returns the index range of all way points between to way points.
+
+        """
+
+        start, end = original_waypoints.index_range_between(
+            pt_start.accumulated_distance, pt_end.accumulated_distance
         )
+        self.examined_points += end - start
+        return start, end
 
     def closeness_criteria(self, path_: Path) -> bool:
         """
@@ -335,47 +391,21 @@ class DouglasPeuckerTransformer(PathTransformer):
 
         """
 
-        distance_threshold = (
-            self.closeness_threshold * path_.way_points[-1].accumulated_distance
-        )
-        self.__logger.debug(
-            "Total distance {}, distance_threshold {}".format(
-                path_.way_points[-1].accumulated_distance, distance_threshold
-            )
-        )
-
-        heights = [p.point.h for p in path_.way_points]
-        elevation_delta = np.max(heights) - np.min(heights)
-        elevation_threshold = self.closeness_threshold * elevation_delta
-        self.__logger.debug(
-            "Total elevation_delta {}, elevation_threshold {}".format(
-                elevation_delta, elevation_threshold
-            )
-        )
-
-        for p1, p2 in zip(path_.way_points[:-1], path_.way_points[1:]):
-            delta_dist = p2.accumulated_distance - p1.accumulated_distance
-            delta_height = abs(p2.point.h - p1.point.h)
+        distances = path_.accumulated_distances
+        heights = path_.heights
+        close_pairs = calc_close_pairs(distances, heights, self.closeness_threshold)
 
-            if p1 == p2:
+        for i in np.flatnonzero(close_pairs).tolist():
+            # the same way point may be contained twice (after replacing a point in drop_points)
+            if path_.way_points[i] is path_.way_points[i + 1]:
                 continue
 
-            if delta_dist < distance_threshold and delta_height < elevation_threshold:
-                self.__logger.debug(
-                    "delta_height {} vs elevation_threshold {}".format(
-                        delta_height, elevation_threshold
-                    )
-                )
-                self.__logger.debug(
-                    "delta_dist {} vs distance_threshold {}".format(
-                        delta_dist, distance_threshold
-                    )
+            self.__logger.debug(
+                "Points found, which are to close to each other: {} and {}".format(
+                    path_.way_points[i].point.__str__(),
+                    path_.way_points[i + 1].point.__str__(),
                 )
-                self.__logger.debug(
-                    "Points found, which are to close to each other: {} and {}".format(
-                        p1.point.__str__(), p2.point.__str__()
-                    )
-                )
-                return True
+            )
+            return True
 
         return False
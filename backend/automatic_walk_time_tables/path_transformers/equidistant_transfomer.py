@@ -1,36 +1,162 @@
+from __future__ import annotations
+
+from typing import Iterator, Tuple
+
+import numpy as np
+
 from automatic_walk_time_tables.path_transformers.path_transfomer import PathTransformer
-from automatic_walk_time_tables.utils.path import Path
+from automatic_walk_time_tables.utils import polyline_encoding
+from automatic_walk_time_tables.utils.path import Path, path_from_arrays
 
 
 class EquidistantTransformer(PathTransformer):
     """
-    Fetches the names for each point in the path.
+    Resamples a path with a fixed spacing (equidistant_distance, in meters).
+
+    By default, a subset of the original way points is selected, such that the selected points
+    are more than equidistant_distance apart.
+
+    With interpolate=True, the positions and heights of the new way points are linearly
+    interpolated along the path instead, i.e. there is a way point every equidistant_distance
+    meters of accumulated distance (plus the end point of the path). Note that the original
+    way points (e.g. summits) are not part of the result, peaks are flattened to the
+    interpolated heights. Since there is no gap larger than equidistant_distance, the result
+    usually has several times more points than the selection (e.g. 2561 instead of 589 points
+    for a 25 km route with 10 m spacing, and a 2.7 times larger polyline).
     """
 
-    def __init__(self, equidistant_distance=10):
+    chunk_size = 8192
+    """ number of way points per chunk of the streaming variant (see stream) """
+
+    def __init__(self, equidistant_distance=10, interpolate: bool = False):
         super().__init__()
         self.equidistant_distance = equidistant_distance
+        self.interpolate = interpolate
+
+    def cache_parameters(self):
+        return [self.equidistant_distance, self.interpolate]
 
     def transform(self, path_: Path) -> Path:
         """
-        Selects a equidistant subset of the path.
+        Resamples the path, see the class documentation.
         """
 
-        equidistant_path = Path()
-        equidistant_path.route_name = path_.route_name
-        equidistant_path.append(path_.way_points[0])
+        if not self.interpolate:
+            return self.select(path_)
 
-        accumulated_distance = 0
+        chunks = list(self.stream(path_))
+        if len(chunks) == 0:
+            return path_from_arrays([], [], [], [], route_name=path_.route_name)
+
+        return path_from_arrays(
+            *(np.concatenate(column) for column in zip(*chunks)),
+            route_name=path_.route_name,
+        )
+
+    def stream(
+        self, path_: Path
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """
+
+        Streaming variant of the interpolation: yields the resampled path in chunks of at most chunk_size
+        way points as tuples of arrays (eastings, northings, heights, accumulated distances), where
+        the coordinates are LV03. The concatenation of all chunks is the result of transform
+        with interpolate=True.
+
+        """
+
+        distances = path_.accumulated_distances
+        if len(distances) == 0:
+            return
+
+        # zero-length segments (duplicated points) can not be interpolated
+        keep = np.diff(distances, append=np.inf) > 0
+        distances = distances[keep]
+        columns = (path_.eastings[keep], path_.northings[keep], path_.heights[keep])
+
+        total_distance = distances[-1]
+        number_of_points = int(np.ceil(total_distance / self.equidistant_distance))
 
-        # select a point every 10 meters
-        for p in path_.way_points:
+        for start in range(0, number_of_points, self.chunk_size):
+            end = min(start + self.chunk_size, number_of_points)
+            positions = np.arange(start, end) * float(self.equidistant_distance)
+            positions = positions[positions < total_distance]
+
+            yield tuple(
+                np.interp(positions, distances, column) for column in columns
+            ) + (positions,)
+
+        # the end point is always part of the resampled path
+        yield tuple(column[-1:] for column in columns) + (distances[-1:],)
+
+    def to_polyline(self, path_: Path) -> str:
+        """
+        Returns the same polyline as transform(path_).to_polyline(), without creating
+        the resampled path if interpolate is set.
+        """
+
+        if not self.interpolate:
+            return self.select(path_).to_polyline()
+
+        return "".join(
+            polyline_encoding.encode_chunks(
+                (
+                    (eastings + 2_000_000, northings + 1_000_000)
+                    for eastings, northings, _, _ in self.stream(path_)
+                ),
+                0,
+            )
+        )
+
+    def select(self, path_: Path) -> Path:
+        """
+        Selects a equidistant subset of the path: starting at the first point, the next
+        selected point is the first one more than equidistant_distance further along the path.
+        The end point is always selected.
+        """
+
+        distances = path_.accumulated_distances
+        number_of_points = len(distances)
+        spacing = self.equidistant_distance
+
+        # plain floats for the comparisons, indexing the array yields slow NumPy scalars
+        values = distances.tolist()
+        indices = [0]
+
+        accumulated_distance = 0
+        index = -1
+        while True:
             if (
-                p.accumulated_distance - accumulated_distance
-                > self.equidistant_distance
+                index + 1 < number_of_points
+                and values[index + 1] - accumulated_distance > spacing
             ):
-                equidistant_path.append(p)
-                accumulated_distance = p.accumulated_distance
+                # dense selections (spacing below the point spacing) need no search
+                index += 1
+            else:
+                # accumulated distances are non-decreasing, thus the points more than spacing
+                # ahead form a suffix. The search result is corrected for rounding, such that
+                # the same point is found as by comparing the differences one by one.
+                index = int(
+                    np.searchsorted(
+                        distances, accumulated_distance + spacing, side="right"
+                    )
+                )
+                while index > 0 and values[index - 1] - accumulated_distance > spacing:
+                    index -= 1
+                while (
+                    index < number_of_points
+                    and values[index] - accumulated_distance <= spacing
+                ):
+                    index += 1
+
+            if index == number_of_points:
+                break
 
-        equidistant_path.append(path_.way_points[-1])
+            indices.append(index)
+            accumulated_distance = values[index]
 
+        indices.append(number_of_points - 1)
+
+        equidistant_path = path_.subset(indices)
+        equidistant_path.route_name = path_.route_name
         return equidistant_path
@@ -1,101 +1,55 @@
 from __future__ import annotations
 
-import json
 import logging
-from typing import List
-
-import requests
 
+from automatic_walk_time_tables.geo_processing.elevation_providers import (
+    ElevationProvider,
+    default_elevation_provider,
+)
 from automatic_walk_time_tables.path_transformers.path_transfomer import PathTransformer
-from automatic_walk_time_tables.utils import point
-from automatic_walk_time_tables.utils.path import Path
-from automatic_walk_time_tables.utils.point import Point, PointType
-from automatic_walk_time_tables.utils.error import UserException
+from automatic_walk_time_tables.utils.path import Path, path_from_coordinates
+from automatic_walk_time_tables.utils.point import PointType
 
 
 class HeightFetcherTransformer(PathTransformer):
     """
+
     Fetch the elevation for a path and returns a new path with min_number_of_points of way_points.
-    """
 
-    PATH_URL = "https://api3.geo.admin.ch/rest/services/profile.json"
+    The elevation is fetched from the given elevation provider (see elevation_providers), by
+    default the local DEM if configured with the profile API of swisstopo as fallback.
 
-    def __init__(self, min_number_of_points: int = 100) -> None:
+    """
+
+    def __init__(
+        self,
+        min_number_of_points: int = 100,
+        provider: ElevationProvider | None = None,
+    ) -> None:
         super().__init__()
 
         self.__logger = logging.getLogger(__name__)
         self.min_number_of_points = min_number_of_points
+        self.provider = (
+            provider if provider is not None else default_elevation_provider()
+        )
 
     def transform(self, path_: Path) -> Path:
-        # check that the path does not have more than 5000 points
-        if len(path_.way_points) > 5000:
-            raise UserException(
-                "Deine Datei hat zu viele Wegpunkte. Bitte reduziere die Anzahl Punkte und probier es erneut."
-            )
-
-        geom_data = {
-            "type": "LineString",
-            "coordinates": [
-                [round(pt.point.lat), round(pt.point.lon)] for pt in path_.way_points
-            ],
-        }
-
-        coord_type = path_.way_points[0].point.type
-        params = {
-            "nb_points": max(path_.number_of_waypoints, self.min_number_of_points),
-            "distinct_points": True,
-            "smart_filling": True,
-            "sr": coord_type,
-        }
-        r = requests.post(
-            self.PATH_URL,
-            headers={"Content-Type": "application/json"},
-            data=json.dumps(geom_data),
-            params=params,
+        eastings, northings, heights = self.provider.profile(
+            path_.eastings, path_.northings, self.min_number_of_points
         )
 
-        self.__logger.info(r.url)
-
         self.__logger.debug(
-            "Fetched elevation for path part and got " + str(r.status_code)
+            "Fetched elevation for %d points with %s",
+            len(eastings),
+            type(self.provider).__name__,
         )
 
-        if r.status_code not in (200, 203):
-            self.__logger.debug("Status Code: " + str(r.status_code))
-            self.__logger.debug("Response: " + r.text)
-            raise Exception("Failed to fetch elevation for path")
-
         # return the path with elevation
-        points: List[Point] = []
-
-        for entry in r.json():
-            if coord_type == PointType.LV03:
-                points.append(
-                    point.Point_LV03(
-                        entry["easting"],
-                        entry["northing"],
-                        float(entry["alts"]["COMB"]),
-                    )
-                )
-            elif coord_type == PointType.LV95:
-                points.append(
-                    point.Point_LV95(
-                        entry["easting"],
-                        entry["northing"],
-                        float(entry["alts"]["COMB"]),
-                    )
-                )
-            elif coord_type == PointType.WGS84:
-                points.append(
-                    point.Point_WGS84(
-                        entry["easting"],
-                        entry["northing"],
-                        float(entry["alts"]["COMB"]),
-                    )
-                )
-            else:
-                raise Exception("Unknown coordinate type")
-
-        new_path = Path(points)
-        new_path.route_name = path_.route_name
-        return new_path
+        return path_from_coordinates(
+            eastings,
+            northings,
+            heights,
+            PointType.LV03,
+            route_name=path_.route_name,
+        )
@@ -1,43 +1,87 @@
-import json
-
-import requests
+from __future__ import annotations
 
 import logging
+import time
+from typing import List, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
 from automatic_walk_time_tables.path_transformers.path_transfomer import PathTransformer
+from automatic_walk_time_tables.utils.name_cache import NameCache, name_cache
 from automatic_walk_time_tables.utils.path import Path
+from automatic_walk_time_tables.utils.way_point import WayPoint
+
+# shared by all naming transformers, keeps the connections to the swiss_TLM_api alive
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=16))
 
 
 class NamingTransformer(PathTransformer):
     """
+
     Fetches the names for each point in the path.
+
+    The names are fetched from the swiss_TLM_api in batches of chunk_size points per request.
+    If a batch fails, the points of the batch are requested one by one, such that a single
+    failing point does not affect the names of the other points. Batches that time out are not
+    retried point by point (an overloaded API would time out for every point), and all requests
+    of a transform share the deadline transform_timeout. Points whose name could not be fetched
+    keep an empty name.
+
+    Fetched names are stored in the name cache (shared by all naming transformers by default),
+    only points without a cached name are sent to the swiss_TLM_api.
+
     """
 
-    def __init__(self, use_default_name: bool = False):
+    url = "http://awt-swiss-tml-api:1848/swiss_name"
+    chunk_size = 100
+    timeout = 60  # in seconds, per request
+    transform_timeout = 120  # in seconds, for all requests of a transform
+
+    def __init__(
+        self,
+        use_default_name: bool = False,
+        session: requests.Session | None = None,
+        cache: NameCache | None = name_cache,
+    ):
         super().__init__()
         self.use_default_name = use_default_name
+        self.session = session if session is not None else _session
+        self.cache = cache
 
     def transform(self, path_: Path) -> Path:
-        for pt in path_.way_points:
-            pt.name = ""  # set default name to empty string
+        way_points = path_.way_points
+        coordinates = []
 
-            url = "http://awt-swiss-tml-api:1848/swiss_name"
+        for pt in way_points:
+            pt.name = ""  # set default name to empty string
 
             lv95 = pt.point.to_LV95()
-            payload = json.dumps([[lv95.lat, lv95.lon]])
-            headers = {"Content-Type": "application/json"}
+            coordinates.append((lv95.lat, lv95.lon))
 
-            try:
-                req = requests.request("GET", url, headers=headers, data=payload)
-                resp = req.json()
+        names = [
+            self.cache.get(coord) if self.cache is not None else None
+            for coord in coordinates
+        ]
+        missing = [i for i, name in enumerate(names) if name is None]
+        deadline = time.monotonic() + self.transform_timeout
+
+        for start in range(0, len(missing), self.chunk_size):
+            if time.monotonic() >= deadline:
+                logger.error(
+                    "Fetching names timed out, %d points keep an empty name",
+                    len(missing) - start,
+                )
+                break
+
+            chunk = missing[start : start + self.chunk_size]
+            chunk_coordinates = [coordinates[i] for i in chunk]
 
-                # Use coordinate if next name is more than 100 meters away
-                if resp[0]["offset"] <= 100 and resp[0]["swiss_name"] != "":
-                    pt.name = resp[0]["swiss_name"]
-                elif self.use_default_name:
-                    pt.name = f"{round(lv95.lat)}, {round(lv95.lon)}"
+            try:
+                fetched_names = self.fetch_names(chunk_coordinates, deadline)
 
             except requests.exceptions.ConnectionError:
                 logger.error(
@@ -45,4 +89,86 @@ class NamingTransformer(PathTransformer):
                 )
                 continue  # TODO: we skip connection errors (see https://github.com/cevi/automatic_walk-time_tables/issues/247)
 
+            except requests.exceptions.Timeout:
+                logger.error(
+                    "Timeout while fetching names for %d points from awt-swiss-tml-api",
+                    len(chunk),
+                )
+                continue
+
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.warning(
+                    "Fetching names for %d points failed (%s), retrying point by point",
+                    len(chunk),
+                    e,
+                )
+                fetched_names = [
+                    self.__fetch_name(coord, deadline) for coord in chunk_coordinates
+                ]
+
+            for i, name in zip(chunk, fetched_names):
+                names[i] = name
+                if name is not None and self.cache is not None:
+                    self.cache.put(coordinates[i], name)
+
+        for pt, coord, name in zip(way_points, coordinates, names):
+            self.__set_name(pt, coord, name)
+
         return path_
+
+    def fetch_names(
+        self, coordinates: List[Tuple[float, float]], deadline: float | None = None
+    ) -> List[dict]:
+        """
+
+        Fetches the names for a list of LV95 coordinates with a single request.
+        Returns one entry of the swiss_name endpoint per coordinate.
+
+        The request times out after timeout seconds, or earlier at the deadline
+        (a time.monotonic() value) if given.
+
+        """
+
+        timeout = self.timeout
+        if deadline is not None:
+            timeout = min(timeout, deadline - time.monotonic())
+            if timeout <= 0:
+                raise requests.exceptions.Timeout(
+                    "Deadline for fetching names exceeded."
+                )
+
+        response = self.session.get(
+            self.url, json=[list(coord) for coord in coordinates], timeout=timeout
+        )
+        response.raise_for_status()
+        names = response.json()
+
+        if not isinstance(names, list) or len(names) != len(coordinates):
+            raise ValueError("Unexpected response of the swiss_name endpoint.")
+
+        return names
+
+    def __fetch_name(self, coord: Tuple[float, float], deadline: float) -> dict | None:
+        if time.monotonic() >= deadline:
+            return None
+
+        try:
+            return self.fetch_names([coord], deadline)[0]
+
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error("Fetching the name for %s failed: %s", coord, e)
+            return None
+
+    def __set_name(self, pt: WayPoint, coord: Tuple[float, float], name: dict | None):
+        if name is None:
+            return
+
+        try:
+            # Use coordinate if next name is more than 100 meters away
+            if name["offset"] <= 100 and name["swiss_name"] != "":
+                pt.name = name["swiss_name"]
+            elif self.use_default_name:
+                pt.name = f"{round(coord[0])}, {round(coord[1])}"
+
+        except (KeyError, TypeError) as e:
+            logger.error("Invalid name for %s: %s", coord, e)
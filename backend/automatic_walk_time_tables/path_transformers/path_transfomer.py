@@ -4,3 +4,14 @@ from automatic_walk_time_tables.utils.path import Path
 class PathTransformer:
     def transform(self, path: Path):
         raise Exception("Not implemented!")
+
+    def cache_parameters(self):
+        """
+
+        Returns the parameters that determine the result of transform (besides the path) as a
+        JSON serializable value, or None if the results must not be cached (the default, e.g.
+        for transformers depending on external services). See TransformerCache.
+
+        """
+
+        return None
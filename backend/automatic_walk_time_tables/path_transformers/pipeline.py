@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from automatic_walk_time_tables.path_transformers.path_transfomer import PathTransformer
+from automatic_walk_time_tables.path_transformers.transformer_cache import (
+    TransformerCache,
+    transformer_cache,
+)
+from automatic_walk_time_tables.utils.path import Path
+
+
+class PipelineStage:
+    """
+
+    A stage of a TransformerPipeline: applies a transformer to the value named source and stores
+    the result as the value named output (defaults to the name of the stage).
+
+    The transformer is either a PathTransformer or a factory, which is called with the values
+    named in inputs (e.g. the POIs for the DouglasPeuckerTransformer) and returns the transformer.
+
+    If keep_provided is set and the output value is already available (e.g. passed to run by the
+    caller), the stage is skipped and the available value is kept.
+
+    """
+
+    def __init__(
+        self,
+        name: str,
+        transformer: PathTransformer | Callable[..., PathTransformer],
+        source: str = "path",
+        inputs: Tuple[str, ...] = (),
+        output: str | None = None,
+        keep_provided: bool = False,
+    ):
+        self.name = name
+        self.transformer = transformer
+        self.source = source
+        self.inputs = tuple(inputs)
+        self.output = output if output is not None else name
+        self.keep_provided = keep_provided
+
+    def create_transformer(self, values: Dict[str, Path]) -> PathTransformer:
+        if isinstance(self.transformer, PathTransformer):
+            return self.transformer
+
+        return self.transformer(*(values[name] for name in self.inputs))
+
+
+class StageMetrics:
+    """
+    Metrics of a single stage of a pipeline run.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.skipped: str | None = None  # reason for skipping the stage
+        self.wall_time = 0.0  # in seconds
+        self.cpu_time = 0.0  # in seconds, of the running thread
+        self.input_points = 0
+        self.output_points = 0
+        self.allocated_bytes: int | None = None  # peak, only if allocations are traced
+
+    def to_json(self):
+        return {
+            "name": self.name,
+            "skipped": self.skipped,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "input_points": self.input_points,
+            "output_points": self.output_points,
+            "allocated_bytes": self.allocated_bytes,
+        }
+
+
+class TransformerPipeline:
+    """
+
+    Declares a sequence of transformer stages once and runs them on named paths, e.g.
+
+        pipeline = TransformerPipeline([
+            PipelineStage("pois", POIsTransformer()),
+            PipelineStage("way_points", lambda pois: DouglasPeuckerTransformer(pois=pois), inputs=("pois",)),
+        ])
+        values = pipeline.run(path=path)  # {"path": ..., "pois": ..., "way_points": ...}
+
+    For every stage the wall time, the CPU time, the number of input and output points and
+    (with trace_allocations) the peak of the allocated memory are recorded, see metrics and
+    report. Allocations are traced with tracemalloc, which slows down the stages considerably
+    and counts the allocations of all threads.
+
+    Results are reused from the cache, which is shared by all pipelines (and thus requests) by
+    default and returns copies of the cached paths (see TransformerCache).
+
+    """
+
+    def __init__(
+        self,
+        stages: List[PipelineStage],
+        name: str = "pipeline",
+        trace_allocations: bool = False,
+        cache: TransformerCache | None = transformer_cache,
+    ):
+        self.stages = stages
+        self.name = name
+        self.trace_allocations = trace_allocations
+        self.cache = cache
+
+        self.metrics: List[StageMetrics] = []
+        self.__logger = logging.getLogger(__name__)
+
+    def run(self, **values: Path | None) -> Dict[str, Path]:
+        """
+
+        Runs all stages. The keyword arguments are the initial values (values set to None are
+        treated as not available). Returns all values, including the outputs of all stages.
+
+        """
+
+        values = {name: value for name, value in values.items() if value is not None}
+        self.metrics = []
+
+        for stage in self.stages:
+            metrics = StageMetrics(stage.name)
+            self.metrics.append(metrics)
+
+            if stage.keep_provided and stage.output in values:
+                metrics.skipped = "provided"
+                metrics.input_points = values[stage.source].number_of_waypoints
+                metrics.output_points = values[stage.output].number_of_waypoints
+                continue
+
+            source = values[stage.source]
+            metrics.input_points = source.number_of_waypoints
+
+            result = self.__run_stage(stage, values, source, metrics)
+
+            values[stage.output] = result
+            metrics.output_points = result.number_of_waypoints
+
+        self.__logger.info("%s: %s", self.name, json.dumps(self.report()))
+        return values
+
+    def __run_stage(
+        self,
+        stage: PipelineStage,
+        values: Dict[str, Path],
+        source: Path,
+        metrics: StageMetrics,
+    ) -> Path:
+        started_tracing = False
+        if self.trace_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            allocated_before, _ = tracemalloc.get_traced_memory()
+
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+
+        try:
+            transformer = stage.create_transformer(values)
+            if self.cache is None:
+                return transformer.transform(source)
+
+            cache_key = self.cache.key(transformer, source)
+            if cache_key is not None:
+                result = self.cache.get(cache_key)
+                if result is not None:
+                    metrics.skipped = "cached"
+                    return result
+
+            result = transformer.transform(source)
+            if cache_key is not None:
+                self.cache.put(cache_key, result)
+            return result
+
+        finally:
+            metrics.cpu_time = time.thread_time() - cpu_start
+            metrics.wall_time = time.perf_counter() - wall_start
+
+            if self.trace_allocations:
+                _, peak = tracemalloc.get_traced_memory()
+                metrics.allocated_bytes = max(peak - allocated_before, 0)
+                if started_tracing:
+                    tracemalloc.stop()
+
+    def get_metrics(self, stage_name: str) -> StageMetrics:
+        """
+        Returns the metrics of the stage with the given name from the last run.
+        """
+
+        return next(metrics for metrics in self.metrics if metrics.name == stage_name)
+
+    def report(self):
+        """
+        Returns the metrics of the last run as a dict (JSON serializable).
+        """
+
+        return {
+            "pipeline": self.name,
+            "wall_time": sum(metrics.wall_time for metrics in self.metrics),
+            "cpu_time": sum(metrics.cpu_time for metrics in self.metrics),
+            "stages": [metrics.to_json() for metrics in self.metrics],
+        }
@@ -1,4 +1,5 @@
 import logging
+import math
 
 import numpy as np
 from automatic_walk_time_tables.path_transformers.path_transfomer import PathTransformer
@@ -27,26 +28,32 @@ class POIsTransformer(PathTransformer):
         else:
             return self.calc_pois(path)
 
+    def cache_parameters(self):
+        return [self.pois_list_as_str, self.pois_distance_str]
+
     def pois_from_distance_string(self, path: Path):
         self.__logger.info(
             "POIs provided. Select POIs based on accumulated distance..."
         )
 
-        pois = Path([])
-        poi_distances = self.pois_distance_str.split(",")
-
-        index = 0
-        for i, point in enumerate(path.way_points):
-            if (
-                point.accumulated_distance - int(float(poi_distances[index])) >= 0
-            ):  # fix bug where poi_distances contained a non-int value
-                pois.append(point)
-                index += 1
+        # int(float(...)): fix bug where poi_distances contained a non-int value
+        poi_distances = np.array(
+            [
+                int(float(poi_distance))
+                for poi_distance in self.pois_distance_str.split(",")
+            ],
+            dtype=np.float64,
+        )
 
-                if index == len(poi_distances):
-                    break
+        # the first point at (or after) each distance, but every point is used at most once:
+        # indices[k] = max(indices[k - 1] + 1, first_indices[k])
+        first_indices = np.searchsorted(
+            path.accumulated_distances, poi_distances, side="left"
+        )
+        offsets = np.arange(len(first_indices))
+        indices = offsets + np.maximum.accumulate(first_indices - offsets)
 
-        return pois
+        return path.subset(indices[indices < path.number_of_waypoints])
 
     def pois_from_string(self, path: Path):
         pois = Path([])
@@ -63,52 +70,71 @@ class POIsTransformer(PathTransformer):
         except Exception as e:
             logging.error(e)
 
-        # find the nearest point for every point in pois_coords
-        for poi in pois_coord:
-            min_dist = np.inf
-            min_index = 0
-            for i, p in enumerate(path.way_points):
-                p_lv95 = p.point.to_LV95()
-
-                dist = (p_lv95.lat - poi.lat) ** 2 + (p_lv95.lon - poi.lon) ** 2
-                if dist < min_dist:
-                    min_dist = dist
-                    min_index = i
+        if len(pois_coord) == 0 or path.number_of_waypoints == 0:
+            return pois
+
+        poi_eastings = np.array([poi.lat for poi in pois_coord])
+        poi_northings = np.array([poi.lon for poi in pois_coord])
+
+        # find the nearest point for every point in pois_coords (the spatial index of the
+        # path works with LV03 coordinates)
+        indices = path.get_closest_indices(
+            poi_eastings - 2_000_000, poi_northings - 1_000_000
+        )
+
+        # squared distances between the POIs and their nearest points in LV95
+        min_dists = (path.eastings[indices] + 2_000_000 - poi_eastings) ** 2 + (
+            path.northings[indices] + 1_000_000 - poi_northings
+        ) ** 2
+
+        for poi, min_index, min_dist in zip(pois_coord, indices, min_dists):
             self.__logger.debug(
                 "Nearest point for %s is %s", poi, path.way_points[min_index]
             )
 
-            # Add POI if path crosses it with a distance of maximum 50m
+            # Add POI if path crosses it, note that the squared distance is compared with 50,
+            # i.e. the POI must be within about 7m of the path
             if min_dist <= 50:
                 pois.insert(path.way_points[min_index])
 
         return pois
 
     def calc_pois(self, path: Path):
-        pois = Path([])
-
         self.__logger.info("No POIs provided. Calculating POIs...")
-        pois.append(path.way_points[0])
+
+        eastings = path.eastings
+        northings = path.northings
+
+        def distance(i: int, j: int) -> float:
+            # same as Point_LV03.distance
+            return math.sqrt(
+                math.pow(eastings[i] - eastings[j], 2)
+                + math.pow(northings[i] - northings[j], 2)
+            )
+
+        start_index = 0
+        end_index = path.number_of_waypoints - 1
 
         # calc extremums of path_
-        max_index = np.argmax([p.point.h for p in path.way_points])
-        min_index = np.argmin([p.point.h for p in path.way_points])
+        heights = path.heights
+        max_index = int(np.argmax(heights))
+        min_index = int(np.argmin(heights))
+
+        indices = [start_index]
 
         # we add extremums to the list of points of interest if they are at least 100m away from the endpoint
         if (
-            path.way_points[max_index].point.distance(path.way_points[0].point) >= 100
-            and path.way_points[min_index].point.distance(path.way_points[0].point)
-            >= 100
+            distance(max_index, start_index) >= 100
+            and distance(min_index, start_index) >= 100
         ):
-            pois.insert(path.way_points[max_index])
+            indices.append(max_index)
         if (
-            path.way_points[min_index].point.distance(path.way_points[-1].point) >= 100
-            and path.way_points[max_index].point.distance(path.way_points[-1].point)
-            >= 100
+            distance(min_index, end_index) >= 100
+            and distance(max_index, end_index) >= 100
         ):
-            pois.insert(path.way_points[min_index])
+            indices.append(min_index)
 
         # add endpoint to list of points of interest
-        pois.append(path.way_points[-1])
+        indices.append(end_index)
 
-        return pois
+        return path.subset(sorted(indices))
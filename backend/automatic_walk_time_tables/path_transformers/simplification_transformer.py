@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import numpy as np
+
+from automatic_walk_time_tables.path_transformers.path_transfomer import PathTransformer
+from automatic_walk_time_tables.utils.path import Path, path_from_arrays
+
+
+class SimplificationTransformer(PathTransformer):
+    """
+
+    Geometric simplification of a path for displaying it (e.g. on the map of the frontend).
+
+    Uses the Ramer–Douglas–Peucker algorithm on the LV03 coordinates: a way point is only kept
+    if removing it would move the route by more than the tolerance (in meters). The tolerance
+    is either given directly or derived from the size of the output (in pixels): with
+    output_size, the tolerance is the size of one pixel if the whole route is drawn onto
+    output_size x output_size pixels, i.e. the removed points are not visible at that size.
+
+    The first and the last point of the path are always kept. Heights and accumulated distances
+    of the kept points are the ones of the original path, hence the result should only be used
+    for displaying the route and not for calculating the walk time table.
+
+    """
+
+    def __init__(self, tolerance: float | None = None, output_size: int | None = None):
+        super().__init__()
+
+        if tolerance is None and output_size is None:
+            raise ValueError("Either a tolerance or an output size must be given.")
+
+        self.tolerance = tolerance
+        self.output_size = output_size
+
+    @staticmethod
+    def from_options(
+        options: dict, output_size: int | None = None
+    ) -> SimplificationTransformer | None:
+        """
+
+        Creates the transformer selected by the options of a request: "simplify_tolerance"
+        (in meters) takes precedence over "simplify_output_size" (in pixels). If neither is
+        set, the passed output_size is used as default; returns None if there is no default.
+
+        """
+
+        if options.get("simplify_tolerance") is not None:
+            return SimplificationTransformer(
+                tolerance=float(options["simplify_tolerance"])
+            )
+
+        if options.get("simplify_output_size") is not None:
+            output_size = int(options["simplify_output_size"])
+
+        if output_size is None:
+            return None
+
+        return SimplificationTransformer(output_size=output_size)
+
+    def get_tolerance(self, path_: Path) -> float:
+        """
+        Returns the tolerance (in meters) used to simplify the path.
+        """
+
+        if self.tolerance is not None:
+            return self.tolerance
+
+        if path_.number_of_waypoints == 0:
+            return 0.0
+
+        extent = max(np.ptp(path_.eastings), np.ptp(path_.northings))
+        return extent / max(self.output_size, 1)
+
+    def cache_parameters(self):
+        return [self.tolerance, self.output_size]
+
+    def transform(self, path_: Path) -> Path:
+        selected = self.select(path_)
+        names = path_.get_names()
+
+        return path_from_arrays(
+            path_.eastings[selected],
+            path_.northings[selected],
+            path_.heights[selected],
+            path_.accumulated_distances[selected],
+            names=[name for name, keep in zip(names, selected) if keep],
+            route_name=path_.route_name,
+        )
+
+    def select(self, path_: Path) -> np.ndarray:
+        """
+        Returns a boolean mask of the way points kept by the simplification.
+        """
+
+        xs = path_.eastings
+        ys = path_.northings
+        selected = np.zeros(len(xs), dtype=bool)
+
+        if len(xs) <= 2:
+            selected[:] = True
+            return selected
+
+        tolerance = self.get_tolerance(path_)
+        selected[0] = selected[-1] = True
+
+        # iterative instead of recursive, long routes would exceed the recursion limit
+        segments = [(0, len(xs) - 1)]
+        while segments:
+            start, end = segments.pop()
+            if end - start < 2:
+                continue
+
+            deviations = self.__deviations(xs, ys, start, end)
+            index = int(np.argmax(deviations))
+
+            if deviations[index] > tolerance:
+                index += start + 1
+                selected[index] = True
+                segments.append((start, index))
+                segments.append((index, end))
+
+        return selected
+
+    @staticmethod
+    def __deviations(xs: np.ndarray, ys: np.ndarray, start: int, end: int):
+        """
+        Distances of the points strictly between start and end to the line through start and end.
+        """
+
+        dx = xs[end] - xs[start]
+        dy = ys[end] - ys[start]
+        px = xs[start + 1 : end] - xs[start]
+        py = ys[start + 1 : end] - ys[start]
+
+        length = np.hypot(dx, dy)
+
+        # e.g. for circular routes: the distances to the start point are used
+        if length == 0:
+            return np.hypot(px, py)
+
+        return np.abs(dx * py - dy * px) / length
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from automatic_walk_time_tables.path_transformers.path_transfomer import PathTransformer
+from automatic_walk_time_tables.utils.path import Path
+
+
+class TransformerCache:
+    """
+
+    Content-addressed LRU cache of transformer results.
+
+    The key of a result is a hash of the content of the input path (see Path.fingerprint), the
+    class of the transformer and its cache_parameters. Transformers without cache parameters
+    are never cached. The memory is bounded by the total number of way points of all cached
+    paths (max_points) and the number of entries (max_entries); the least recently used
+    entries are evicted first.
+
+    Paths are copied when they are stored and when they are returned, such that modifying a
+    returned path (e.g. naming its way points) never modifies the cache.
+
+    """
+
+    def __init__(self, max_points: int = 1_000_000, max_entries: int = 256):
+        self.max_points = max_points
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.__entries: OrderedDict[str, Path] = OrderedDict()
+        self.__number_of_points = 0
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        transformer: PathTransformer, path: Path, fingerprint: str | None = None
+    ) -> str | None:
+        """
+
+        Returns the key of the result of transformer.transform(path), or None if it can not be
+        cached. The fingerprint of the path can be passed if it is already known.
+
+        """
+
+        parameters = transformer.cache_parameters()
+        if parameters is None:
+            return None
+
+        transformer_class = type(transformer)
+        content = json.dumps(
+            [
+                transformer_class.__module__ + "." + transformer_class.__qualname__,
+                parameters,
+                fingerprint if fingerprint is not None else path.fingerprint(),
+            ]
+        )
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Path | None:
+        with self.__lock:
+            path = self.__entries.get(key)
+
+            if path is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.__entries.move_to_end(key)
+
+        return path.copy()
+
+    def put(self, key: str, path: Path) -> None:
+        path = path.copy()
+        number_of_points = path.number_of_waypoints
+
+        if number_of_points > self.max_points:
+            return
+
+        with self.__lock:
+            previous = self.__entries.pop(key, None)
+            if previous is not None:
+                self.__number_of_points -= previous.number_of_waypoints
+
+            self.__entries[key] = path
+            self.__number_of_points += number_of_points
+
+            while (
+                self.__number_of_points > self.max_points
+                or len(self.__entries) > self.max_entries
+            ):
+                _, evicted = self.__entries.popitem(last=False)
+                self.__number_of_points -= evicted.number_of_waypoints
+                self.evictions += 1
+
+    def transform(self, transformer: PathTransformer, path: Path) -> Path:
+        """
+        Returns transformer.transform(path), using the cached result if available.
+        """
+
+        key = self.key(transformer, path)
+        if key is None:
+            return transformer.transform(path)
+
+        result = self.get(key)
+        if result is None:
+            result = transformer.transform(path)
+            self.put(key, result)
+
+        return result
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.__number_of_points = 0
+
+    def stats(self):
+        """
+        Returns the counters of the cache as a dict (JSON serializable), e.g. for monitoring.
+        """
+
+        with self.__lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self.__entries),
+                "points": self.__number_of_points,
+                "max_entries": self.max_entries,
+                "max_points": self.max_points,
+            }
+
+
+# shared by all pipelines of the backend
+transformer_cache = TransformerCache(
+    max_points=int(os.environ.get("TRANSFORMER_CACHE_MAX_POINTS", 1_000_000)),
+    max_entries=int(os.environ.get("TRANSFORMER_CACHE_MAX_ENTRIES", 256)),
+)
@@ -0,0 +1,117 @@
+"""
+
+Compact, versioned binary encoding for the columns of a path.
+
+Layout (all values little-endian):
+
+    header:  magic b"AWTP" | uint8 version | uint8 flags | uint32 number of points
+    payload: (zlib compressed if FLAG_COMPRESSED is set)
+             4 x int64 first values of the columns (eastings, northings, heights, accumulated distances)
+             4 x (n - 1) deltas of the columns as int32 (int64 if FLAG_WIDE_DELTAS is set)
+             names joined by NAME_SEPARATOR as UTF-8 (only if FLAG_NAMES is set)
+
+All columns are stored in millimetres, coordinates are LV03.
+
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from typing import List, Tuple
+
+import numpy as np
+
+MAGIC = b"AWTP"
+VERSION = 1
+
+FLAG_COMPRESSED = 0b001
+FLAG_WIDE_DELTAS = 0b010
+FLAG_NAMES = 0b100
+
+NAME_SEPARATOR = "\x00"
+
+_HEADER = struct.Struct("<4sBBI")
+_SCALE = 1_000.0  # millimetres
+
+
+def encode_columns(
+    columns: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    names: List[str] | None = None,
+    compress: bool = True,
+) -> bytes:
+    """
+    Encodes the columns (eastings, northings, heights, accumulated distances) of a path.
+    """
+
+    number_of_points = len(columns[0])
+    quantized = np.rint(np.stack(columns) * _SCALE).astype("<i8").reshape(4, -1)
+
+    flags = 0
+    first_values = quantized[:, :1] if number_of_points > 0 else np.zeros((4, 1))
+    deltas = np.diff(quantized, axis=1)
+
+    if deltas.size > 0 and (
+        deltas.min() < np.iinfo(np.int32).min or deltas.max() > np.iinfo(np.int32).max
+    ):
+        flags |= FLAG_WIDE_DELTAS
+    else:
+        deltas = deltas.astype("<i4")
+
+    payload = first_values.astype("<i8").tobytes() + deltas.tobytes()
+
+    if names is not None and any(names):
+        flags |= FLAG_NAMES
+        payload += NAME_SEPARATOR.join(name or "" for name in names).encode("utf-8")
+
+    if compress:
+        flags |= FLAG_COMPRESSED
+        payload = zlib.compress(payload)
+
+    return _HEADER.pack(MAGIC, VERSION, flags, number_of_points) + payload
+
+
+def decode_columns(
+    data: bytes,
+) -> Tuple[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray], List[str] | None]:
+    """
+    Decodes the columns (eastings, northings, heights, accumulated distances) and the names of a path.
+    """
+
+    magic, version, flags, number_of_points = _HEADER.unpack_from(data)
+
+    if magic != MAGIC:
+        raise ValueError("Not a binary encoded path.")
+
+    if version != VERSION:
+        raise ValueError(
+            "Unsupported version {} of binary encoded path.".format(version)
+        )
+
+    payload = memoryview(data)[_HEADER.size :]
+    if flags & FLAG_COMPRESSED:
+        payload = memoryview(zlib.decompress(payload))
+
+    first_values = np.frombuffer(payload, dtype="<i8", count=4)
+    offset = first_values.nbytes
+
+    delta_type = "<i8" if flags & FLAG_WIDE_DELTAS else "<i4"
+    number_of_deltas = 4 * max(number_of_points - 1, 0)
+    deltas = np.frombuffer(
+        payload, dtype=delta_type, count=number_of_deltas, offset=offset
+    ).reshape(4, -1)
+    offset += deltas.nbytes
+
+    quantized = np.empty((4, number_of_points), dtype=np.int64)
+    if number_of_points > 0:
+        quantized[:, 0] = first_values
+        np.cumsum(deltas, axis=1, out=quantized[:, 1:])
+        quantized[:, 1:] += first_values[:, None]
+
+    columns = quantized / _SCALE
+
+    names = None
+    if flags & FLAG_NAMES:
+        names = bytes(payload[offset:]).decode("utf-8").split(NAME_SEPARATOR)
+
+    return (columns[0], columns[1], columns[2], columns[3]), names
@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import logging
 import pathlib
+import xml.etree.ElementTree as ElementTree
+from array import array
 from typing import List
 
-import gpxpy
+import numpy as np
 
 from . import path
 from . import point
@@ -17,6 +19,9 @@ class GeoFileParser(object):
     It creates objects of type path.Path containing the waypoints of the GeoFile.
     """
 
+    chunk_size = 1 << 16
+    """ number of characters passed to the XML parser at once (see __parse_gpx_file) """
+
     def __init__(self, fetch_elevation=True):
         """
         Constructor for GeoFileParser. This class can parse GPX and KML files.
@@ -80,16 +85,12 @@ class GeoFileParser(object):
         coordinates = [c.split(",") for c in coordinates]
 
         if len(coordinates[0]) == 2:
-            coordinates = [
-                point.Point_LV95(float(c[0]), float(c[1])) for c in coordinates
-            ]
-        else:
-            coordinates = [
-                point.Point_LV95(float(c[0]), float(c[1]), float(c[2]))
-                for c in coordinates
-            ]
+            coordinates = [(c[0], c[1], -1.0) for c in coordinates]
 
-        path_ = path.Path(coordinates)
+        lv95 = np.array(coordinates, dtype=np.float64).reshape(-1, 3)
+        path_ = path.path_from_coordinates(
+            lv95[:, 0], lv95[:, 1], lv95[:, 2], point.PointType.LV95
+        )
 
         if not path_.has_elevation_for_all_points():
             path_ = self.height_fetcher.transform(path_)
@@ -98,17 +99,106 @@ class GeoFileParser(object):
 
         return path_
 
+    @staticmethod
+    def __path_from_WGS84(wgs84_coordinates) -> path.Path:
+        """
+        Creates a path from a list of (latitude, longitude, elevation) tuples. All points
+        are converted to LV03 in a single call. A missing elevation is stored as -1.0.
+        """
+
+        wgs84 = np.array(wgs84_coordinates, dtype=np.float64).reshape(-1, 3)
+        heights = np.nan_to_num(wgs84[:, 2], nan=-1.0)
+
+        return path.path_from_coordinates(
+            wgs84[:, 0], wgs84[:, 1], heights, point.PointType.WGS84
+        )
+
     def __parse_gpx_file(self, gpx_raw_data: str) -> path.Path:
-        gpx: gpxpy.gpx = gpxpy.parse(gpx_raw_data)
+        """
+
+        Parses a GPX file incrementally: the content is passed to the XML parser in chunks of
+        chunk_size characters, the track points are read into coordinate arrays while the XML is
+        parsed and every element is discarded as soon as it has been read. Thus, neither a copy
+        of the content nor the document as a whole is held in memory. All points are converted
+        to LV03 in a single call.
+
+        Like gpxpy, only the track points are parsed (routes and way points are ignored), every
+        track segment is counted as a track and the route name is the name of the metadata (GPX
+        1.1) or of the document (GPX 1.0).
+
+        """
+
         paths: List[path.Path] = []
-        for track in gpx.tracks:
-            for segment in track.segments:
-                points: List[point.Point_WGS84] = []
-                for p in segment.points:
-                    points.append(
-                        point.Point_WGS84(p.latitude, p.longitude, p.elevation)
+        version = "1.0"
+        gpx_name = None
+
+        latitudes, longitudes, elevations = array("d"), array("d"), array("d")
+        elevation = -1.0
+
+        # the currently open elements (the root element is the first) and their tags without
+        # namespace, e.g. "trkpt" for "{http://www.topografix.com/GPX/1/1}trkpt"
+        elements: List[ElementTree.Element] = []
+        tags: List[str] = []
+        local_names = {}
+
+        try:
+            for event, element in self.__xml_events(gpx_raw_data):
+                if event == "start":
+                    elements.append(element)
+                    tag = local_names.get(element.tag)
+                    if tag is None:
+                        tag = local_names[element.tag] = element.tag.rsplit("}", 1)[-1]
+                    tags.append(tag)
+
+                    if len(elements) == 1:
+                        version = element.get("version") or "1.0"
+                    elif tags[-1] == "trkseg" and tags[-2] == "trk":
+                        latitudes, longitudes = array("d"), array("d")
+                        elevations = array("d")
+                    elif tags[-1] == "trkpt" and tags[-2] == "trkseg":
+                        elevation = -1.0
+
+                    continue
+
+                tag = tags[-1]
+                parent_tag = tags[-2] if len(tags) > 1 else None
+
+                if tag == "ele" and parent_tag == "trkpt":
+                    # an empty elevation (e.g. <ele/>) is treated as missing
+                    text = element.text.strip() if element.text is not None else ""
+                    elevation = float(text) if text else -1.0
+
+                elif tag == "trkpt" and parent_tag == "trkseg":
+                    latitudes.append(float(element.get("lat")))
+                    longitudes.append(float(element.get("lon")))
+                    elevations.append(elevation)
+
+                elif tag == "trkseg" and parent_tag == "trk":
+                    paths.append(
+                        path.path_from_coordinates(
+                            np.frombuffer(latitudes, dtype=np.float64),
+                            np.frombuffer(longitudes, dtype=np.float64),
+                            np.nan_to_num(
+                                np.frombuffer(elevations, dtype=np.float64), nan=-1.0
+                            ),
+                            point.PointType.WGS84,
+                        )
                     )
-                paths.append(path.Path(points))
+
+                elif tag == "name" and gpx_name is None:
+                    if (version == "1.1" and tags[:-1] == ["gpx", "metadata"]) or (
+                        version != "1.1" and tags[:-1] == ["gpx"]
+                    ):
+                        gpx_name = element.text
+
+                # the element has been read, free its memory
+                elements.pop()
+                tags.pop()
+                if len(elements) > 0:
+                    elements[-1].remove(element)
+
+        except (ElementTree.ParseError, TypeError, ValueError) as e:
+            raise Exception("Invalid GPX file: {}".format(e))
 
         if len(paths) > 1:
             raise Exception("More than one track found")
@@ -117,7 +207,7 @@ class GeoFileParser(object):
             raise Exception("No track found")
 
         path_ = paths[0]
-        path_.route_name = gpx.name if gpx.name else ""
+        path_.route_name = gpx_name if gpx_name else ""
         if not path_.has_elevation_for_all_points():
             path_ = self.height_fetcher.transform(path_)
         else:
@@ -129,6 +219,20 @@ class GeoFileParser(object):
 
         return path_
 
+    def __xml_events(self, raw_data: str):
+        """
+        Yields the start and end events of the XML content, like ElementTree.iterparse.
+        """
+
+        parser = ElementTree.XMLPullParser(events=("start", "end"))
+
+        for start in range(0, len(raw_data), self.chunk_size):
+            parser.feed(raw_data[start : start + self.chunk_size])
+            yield from parser.read_events()
+
+        parser.close()
+        yield from parser.read_events()
+
     def parse_kml_file__(self, raw_data: str) -> path.Path:
         # see if <name>...</name> is present
         start_index = raw_data.find("<name>")
@@ -195,15 +299,11 @@ class GeoFileParser(object):
             c2 = float(coordinates[0][1])
             if c1 < c2:
                 # file actually has latitudes and longitudes flipped
-                coordinates = [
-                    point.Point_WGS84(float(c[1]), float(c[0])) for c in coordinates
-                ]
+                coordinates = [(float(c[1]), float(c[0]), -1.0) for c in coordinates]
             else:
-                coordinates = [
-                    point.Point_WGS84(float(c[0]), float(c[1])) for c in coordinates
-                ]
+                coordinates = [(float(c[0]), float(c[1]), -1.0) for c in coordinates]
 
-            path_ = path.Path(coordinates)
+            path_ = self.__path_from_WGS84(coordinates)
 
             if self.fetch_elevation:
                 path_ = self.height_fetcher.transform(path_)
@@ -216,16 +316,10 @@ class GeoFileParser(object):
         c2 = float(coordinates[0][1])
         if c1 < c2:
             # latitudes and longitudes are flipped
-            coordinates = [
-                point.Point_WGS84(float(c[1]), float(c[0]), float(c[2]))
-                for c in coordinates
-            ]
+            coordinates = [(float(c[1]), float(c[0]), float(c[2])) for c in coordinates]
         else:
-            coordinates = [
-                point.Point_WGS84(float(c[0]), float(c[1]), float(c[2]))
-                for c in coordinates
-            ]
+            coordinates = [(float(c[0]), float(c[1]), float(c[2])) for c in coordinates]
 
-        path_ = path.Path(coordinates)
+        path_ = self.__path_from_WGS84(coordinates)
         path_.route_name = route_name if route_name else ""
         return path_
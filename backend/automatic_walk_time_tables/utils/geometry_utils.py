@@ -1,5 +1,7 @@
 from typing import Tuple
 
+import numpy as np
+
 from automatic_walk_time_tables.utils import path, point
 from automatic_walk_time_tables.utils.way_point import WayPoint
 
@@ -24,6 +26,14 @@ def calc_secant_line(pt_A: WayPoint, pt_B: WayPoint):
     x1, y1 = pt_A.accumulated_distance, pt_A.point.h
     x2, y2 = pt_B.accumulated_distance, pt_B.point.h
 
+    return calc_secant_line_of(x1, y1, x2, y2)
+
+
+def calc_secant_line_of(x1: float, y1: float, x2: float, y2: float):
+    """
+    Same as calc_secant_line, but for the locations (x1, x2) and elevations (y1, y2) of the points.
+    """
+
     # if the location of A and B is identical, the slope m is defined as 0
     m: float = (y1 - y2) / (x1 - x2) if (x1 - x2) != 0 else 0.0
 
@@ -33,6 +43,35 @@ def calc_secant_line(pt_A: WayPoint, pt_B: WayPoint):
     return m, b
 
 
+def calc_secant_deviations(
+    m: float, b: float, distances: np.ndarray, heights: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized variant of calc_secant_elevation: returns the absolute deviations of the points
+    (given by their locations and elevations) from the secant line defined by m and b.
+    """
+
+    return np.abs(m * np.asarray(distances) + b - np.asarray(heights))
+
+
+def calc_close_pairs(
+    distances: np.ndarray, heights: np.ndarray, closeness_threshold: float
+) -> np.ndarray:
+    """
+    Returns for each pair of adjacent points whether they are too close to each other, i.g.
+    whether both the distance and the elevation difference between them are below the given
+    fraction of the total distance and of the elevation range.
+    """
+
+    distance_threshold = closeness_threshold * distances[-1]
+    elevation_threshold = closeness_threshold * (np.max(heights) - np.min(heights))
+
+    delta_dist = np.diff(distances)
+    delta_height = np.abs(np.diff(heights))
+
+    return (delta_dist < distance_threshold) & (delta_height < elevation_threshold)
+
+
 def calc_perimeter(path_: path.Path) -> Tuple[point.Point_LV03, point.Point_LV03]:
     min_latitude = None
     max_latitude = None
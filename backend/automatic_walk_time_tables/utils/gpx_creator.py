@@ -4,9 +4,13 @@ import xml.etree.ElementTree as ET
 import re
 import os
 import gpxpy
+import numpy as np
 from gpxpy.gpx import GPX
 import requests
 
+from automatic_walk_time_tables.geo_processing.coord_transformation import (
+    LV03toWGS84_array,
+)
 from automatic_walk_time_tables.utils import path
 
 
@@ -120,16 +124,25 @@ def minify_xml(xml_content):
     return minified_xml
 
 
+def to_WGS84_arrays(_path: path.Path):
+    """
+    Converts all points of the path to WGS84 in a single call.
+    Returns lists of latitudes, longitudes, and elevations.
+    """
+
+    heights = _path.heights
+    lat, lon, elevation = LV03toWGS84_array(_path.eastings, _path.northings, heights)
+
+    # points without elevation keep their placeholder value, see Point_LV03.to_WGS84
+    elevation = np.where(heights != -1.0, elevation, -1.0)
+    return lat.tolist(), lon.tolist(), elevation.tolist()
+
+
 def add_track_points(_path: path.Path, gpx_f: GPX):
     gpx_track = gpxpy.gpx.GPXTrack()
     gpx_segment = gpxpy.gpx.GPXTrackSegment()
 
-    for i, point in enumerate(_path.way_points):
-        p84 = point.point.to_WGS84()
-        lat = p84.lat
-        lon = p84.lon
-        elevation = p84.h
-
+    for i, (lat, lon, elevation) in enumerate(zip(*to_WGS84_arrays(_path))):
         # each track points must have the swisstopo:routepoint_id extension with a
         # unique id for each point
         track_point = gpxpy.gpx.GPXTrackPoint(lat, lon, elevation=elevation)
@@ -144,11 +157,16 @@ def add_track_points(_path: path.Path, gpx_f: GPX):
 def add_waypoints(_path: path.Path, _way_points: path.Path, gpx_f: GPX):
 
     accumulated_distance = 0
-    for i, point in enumerate(_way_points.way_points):
-        p84 = point.point.to_WGS84()
-        lat = p84.lat
-        lon = p84.lon
-        elevation = p84.h
+    wgs84_coordinates = zip(*to_WGS84_arrays(_way_points))
+
+    # index of the closest track point for every way point (single batched lookup)
+    closest_track_points = _path.get_closest_indices(
+        _way_points.eastings, _way_points.northings
+    )
+
+    for i, (point, (lat, lon, elevation)) in enumerate(
+        zip(_way_points.way_points, wgs84_coordinates)
+    ):
         name = point.name
 
         if name == "":
@@ -160,10 +178,7 @@ def add_waypoints(_path: path.Path, _way_points: path.Path, gpx_f: GPX):
 
         # this must be the ID of a track point at the same location
         gpx_extension_route_id = ET.Element("swisstopo:waypoint_routepoint_id")
-        closest_track_point = _path.get_closest_point(point.point)
-        gpx_extension_route_id.text = (
-            f"1{_path.way_points.index(closest_track_point):08d}"
-        )
+        gpx_extension_route_id.text = f"1{closest_track_points[i]:08d}"
 
         gpx_extension_control = ET.Element("swisstopo:waypoint_is_controlpoint")
         # 1 = for start or end point, 0 = for all other points
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class NameCache:
+    """
+
+    Cache for the responses of the swiss_name endpoint of the swiss_TLM_api, keyed by the LV95
+    coordinate of the request snapped to a grid of grid_size meters.
+
+    The entries are kept in memory (at most max_entries, least recently used entries are evicted
+    first) and, if a file path is given, in a SQLite database, such that the cache survives
+    restarts. The database holds at most max_disk_entries rows: if there are more, the least
+    recently stored or loaded rows are deleted, down to 90% of max_disk_entries (such that not
+    every new entry triggers a deletion).
+
+    Since points of the same grid cell share an entry, the offset of a cached entry (the
+    distance between the requested point and the named object) is recalculated for every
+    lookup from the location of the named object. Thus, acceptance rules based on the offset
+    (e.g. offset <= 100) give the same result for cached and fetched entries.
+
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        grid_size: float = 1.0,
+        path: str | None = None,
+        max_disk_entries: int = 1_000_000,
+    ):
+        self.max_entries = max_entries
+        self.grid_size = grid_size
+        self.max_disk_entries = max_disk_entries
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self.__entries: OrderedDict[str, dict] = OrderedDict()
+        self.__lock = threading.Lock()
+
+        self.__database: sqlite3.Connection | None = None
+        self.__disk_entries = 0  # upper bound of the number of rows of the database
+        self.__last_used = 0.0
+        if path is not None:
+            self.__database = sqlite3.connect(path, check_same_thread=False)
+            self.__database.execute(
+                "CREATE TABLE IF NOT EXISTS names "
+                "(key TEXT PRIMARY KEY, entry TEXT NOT NULL, last_used REAL NOT NULL DEFAULT 0)"
+            )
+
+            # databases created before the size limit have no last_used column
+            columns = [
+                row[1] for row in self.__database.execute("PRAGMA table_info(names)")
+            ]
+            if "last_used" not in columns:
+                self.__database.execute(
+                    "ALTER TABLE names ADD COLUMN last_used REAL NOT NULL DEFAULT 0"
+                )
+
+            self.__database.execute(
+                "CREATE INDEX IF NOT EXISTS names_last_used ON names (last_used)"
+            )
+            self.__database.commit()
+
+            self.__disk_entries = self.__count_disk_entries()
+            self.__prune_disk_entries()
+
+    def key(self, coord: Tuple[float, float]) -> str:
+        return "{}:{}".format(
+            round(coord[0] / self.grid_size), round(coord[1] / self.grid_size)
+        )
+
+    def get(self, coord: Tuple[float, float]) -> dict | None:
+        """
+        Returns the cached entry for the LV95 coordinate (with a recalculated offset), or None.
+        """
+
+        key = self.key(coord)
+
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry is not None:
+                self.hits += 1
+                self.__entries.move_to_end(key)
+
+            elif self.__database is not None:
+                row = self.__database.execute(
+                    "SELECT entry FROM names WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row is not None:
+                    self.disk_hits += 1
+                    entry = json.loads(row[0])
+                    self.__store(key, entry)
+                    self.__touch(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+        entry = dict(entry)
+        entry["offset"] = round(math.dist(coord, entry["lv95_coord"]))
+        return entry
+
+    def put(self, coord: Tuple[float, float], entry: dict) -> None:
+        """
+        Stores an entry of the swiss_name endpoint, entries without name location are ignored.
+        """
+
+        try:
+            math.dist(coord, entry["lv95_coord"])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        key = self.key(coord)
+
+        with self.__lock:
+            self.__store(key, dict(entry))
+
+            if self.__database is not None:
+                try:
+                    self.__database.execute(
+                        "INSERT OR REPLACE INTO names (key, entry, last_used) VALUES (?, ?, ?)",
+                        (key, json.dumps(entry), self.__now()),
+                    )
+                    self.__database.commit()
+
+                    # replaced rows are counted as well, the count is corrected when pruning
+                    self.__disk_entries += 1
+                    if self.__disk_entries > self.max_disk_entries:
+                        self.__disk_entries = self.__count_disk_entries()
+                        self.__prune_disk_entries()
+
+                except sqlite3.Error as e:
+                    logger.error("Storing the name in the name cache failed: %s", e)
+
+    def __store(self, key: str, entry: dict) -> None:
+        self.__entries[key] = entry
+        self.__entries.move_to_end(key)
+
+        while len(self.__entries) > self.max_entries:
+            self.__entries.popitem(last=False)
+
+    def __touch(self, key: str) -> None:
+        try:
+            self.__database.execute(
+                "UPDATE names SET last_used = ? WHERE key = ?", (self.__now(), key)
+            )
+            self.__database.commit()
+        except sqlite3.Error as e:
+            logger.error("Updating the name cache failed: %s", e)
+
+    def __now(self) -> float:
+        # strictly increasing, such that the order of use is kept for fast successive calls
+        self.__last_used = max(time.time(), math.nextafter(self.__last_used, math.inf))
+        return self.__last_used
+
+    def __count_disk_entries(self) -> int:
+        return self.__database.execute("SELECT COUNT(*) FROM names").fetchone()[0]
+
+    def __prune_disk_entries(self) -> None:
+        if self.__disk_entries <= self.max_disk_entries:
+            return
+
+        number_of_deleted = self.__disk_entries - int(self.max_disk_entries * 0.9)
+        self.__database.execute(
+            "DELETE FROM names WHERE key IN "
+            "(SELECT key FROM names ORDER BY last_used LIMIT ?)",
+            (number_of_deleted,),
+        )
+        self.__database.commit()
+        self.__disk_entries -= number_of_deleted
+
+    def stats(self):
+        """
+        Returns the counters of the cache as a dict (JSON serializable), e.g. for monitoring.
+        """
+
+        with self.__lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (
+                    (self.hits + self.disk_hits) / lookups if lookups > 0 else 0.0
+                ),
+                "entries": len(self.__entries),
+                "max_entries": self.max_entries,
+                "disk_entries": self.__disk_entries,
+                "max_disk_entries": self.max_disk_entries,
+            }
+
+
+# shared by all naming transformers of the backend
+name_cache = NameCache(
+    max_entries=int(os.environ.get("NAME_CACHE_MAX_ENTRIES", 100_000)),
+    grid_size=float(os.environ.get("NAME_CACHE_GRID_SIZE", 1.0)),
+    path=os.environ.get("NAME_CACHE_PATH"),
+    max_disk_entries=int(os.environ.get("NAME_CACHE_MAX_DISK_ENTRIES", 1_000_000)),
+)
@@ -1,12 +1,29 @@
-import copy
-import re
-from typing import List
-
-import polyline
+from __future__ import annotations
 
-from automatic_walk_time_tables.utils.point import Point_LV03, Point
+import base64
+import bisect
+import hashlib
+import json
+import operator
+import re
+from typing import List, Tuple
+
+import numpy as np
+
+from automatic_walk_time_tables.geo_processing.coord_transformation import (
+    WGS84toLV03_array,
+)
+from automatic_walk_time_tables.utils import polyline_encoding
+from automatic_walk_time_tables.utils.binary_encoding import (
+    decode_columns,
+    encode_columns,
+)
+from automatic_walk_time_tables.utils.point import Point_LV03, Point, PointType
+from automatic_walk_time_tables.utils.spatial_index import GridIndex
 from automatic_walk_time_tables.utils.way_point import WayPoint, way_point_from_json
 
+_accumulated_distance = operator.attrgetter("accumulated_distance")
+
 
 class Path:
     """
@@ -18,12 +35,35 @@ class Path:
     Path objects can be manipulated with PathTransformers, e.g. a naming transformer can be applied,
     which adds names to all way points.
 
+    Internally, a path uses one of two storage layouts:
+
+    - columnar: easting, northing (LV03), height and accumulated distance are stored in
+      contiguous float64 arrays, plus an optional name column. Paths created with
+      `path_from_arrays` start in this layout.
+    - way points: an ordered list of WayPoint objects.
+
+    The `way_points` property is a lazy view: accessing it on a columnar path materializes
+    the WayPoint objects once, from then on the way point list is the source of truth (way
+    points may be modified in place). The array properties (`eastings`, `northings`, `heights`
+    and `accumulated_distances`) are available in both layouts, on a columnar path they are
+    returned without copying any data.
+
     """
 
     def __init__(self, points: List[Point] = None) -> None:
-        self.__way_points: List[WayPoint] = []
+        self.__way_points: List[WayPoint] | None = []
         self.__total_distance = 0.0
 
+        # columnar storage, only used as long as no way points have been materialized
+        self.__eastings: np.ndarray | None = None
+        self.__northings: np.ndarray | None = None
+        self.__heights: np.ndarray | None = None
+        self.__accumulated_distances: np.ndarray | None = None
+        self.__names: List[str] | None = None
+
+        # lazily built, invalidated whenever the path is modified
+        self.__spatial_index: GridIndex | None = None
+
         self.route_name = ""
 
         self.append_points(points)
@@ -39,16 +79,63 @@ class Path:
         if points is None or len(points) == 0:
             return
 
-        for i, pkt in enumerate(points):
-            if i == 0 and len(self.__way_points) == 0:
-                self.__way_points.append(WayPoint(0.0, pkt.to_LV03()))
-                continue
+        lv03 = [pkt.to_LV03() for pkt in points]
+        self.append_coordinates(
+            np.fromiter((pkt.lat for pkt in lv03), dtype=np.float64, count=len(lv03)),
+            np.fromiter((pkt.lon for pkt in lv03), dtype=np.float64, count=len(lv03)),
+            np.fromiter((pkt.h for pkt in lv03), dtype=np.float64, count=len(lv03)),
+        )
 
-            last_coord: Point_LV03 = self.__way_points[-1].point.to_LV03()
-            coord: Point_LV03 = pkt.to_LV03()
+    def append_coordinates(
+        self, eastings: np.ndarray, northings: np.ndarray, heights: np.ndarray
+    ) -> None:
+        """
 
-            self.__total_distance += last_coord.distance(coord)
-            self.__way_points.append(WayPoint(self.__total_distance, coord))
+        Appends way points given by their LV03 coordinates and heights to the end of the path.
+        The accumulated distances of all new way points are calculated in a single pass.
+
+        """
+
+        if len(eastings) == 0:
+            return
+
+        if self.number_of_waypoints == 0:
+            distances = _accumulate_distances(eastings, northings)
+        else:
+            last_point = self.__last_point()
+            distances = _accumulate_distances(
+                eastings,
+                northings,
+                last_point.lat,
+                last_point.lon,
+                self.__total_distance,
+            )
+
+        if self.__way_points is None or self.number_of_waypoints == 0:
+            names = self.__names
+            if names is not None:
+                names = names + [None] * len(distances)
+
+            self._set_columns(
+                np.concatenate((self.eastings, eastings)),
+                np.concatenate((self.northings, northings)),
+                np.concatenate((self.heights, heights)),
+                np.concatenate((self.accumulated_distances, distances)),
+                names,
+            )
+            return
+
+        self.__way_points.extend(
+            WayPoint(distance, Point_LV03(easting, northing, height))
+            for easting, northing, height, distance in zip(
+                np.asarray(eastings, dtype=np.float64).tolist(),
+                np.asarray(northings, dtype=np.float64).tolist(),
+                np.asarray(heights, dtype=np.float64).tolist(),
+                distances.tolist(),
+            )
+        )
+        self.__total_distance = float(distances[-1])
+        self.__invalidate_indices()
 
     def append(self, way_point: WayPoint) -> None:
         """
@@ -61,7 +148,8 @@ class Path:
         assert self.__total_distance <= way_point.accumulated_distance
 
         self.__total_distance = way_point.accumulated_distance
-        self.__way_points.append(way_point)
+        self.way_points.append(way_point)
+        self.__invalidate_indices()
 
     def insert(self, way_point: WayPoint, index: int = None) -> None:
         """
@@ -80,17 +168,150 @@ class Path:
 
         # Insert in correct place
         if index is None:
-            index = next(
-                i
-                for i, pkt in enumerate(self.__way_points)
-                if pkt.accumulated_distance >= way_point.accumulated_distance
-            )
+            index = self.bisect_left(way_point.accumulated_distance)
 
-        self.__way_points.insert(index, way_point)
+        self.way_points.insert(index, way_point)
+        self.__invalidate_indices()
 
     def remove(self, way_point: WayPoint):
-        self.__way_points.remove(way_point)
-        self.__total_distance = self.__way_points[-1].accumulated_distance
+        index = self.index(way_point)
+        del self.way_points[index]
+
+        # only removing the last way point changes the total distance
+        if index == len(self.__way_points):
+            self.__total_distance = (
+                self.__way_points[-1].accumulated_distance
+                if len(self.__way_points) > 0
+                else 0.0
+            )
+
+        self.__invalidate_indices()
+
+    def bisect_left(self, accumulated_distance: float) -> int:
+        """
+
+        Returns the index of the first way point with an accumulated distance >= accumulated_distance.
+
+        The way points of a path are ordered by their accumulated distance, thus the lookup
+        is a binary search, O(log n).
+
+        """
+
+        if self.__way_points is None:
+            return int(
+                np.searchsorted(
+                    self.__accumulated_distances, accumulated_distance, side="left"
+                )
+            )
+
+        return bisect.bisect_left(
+            self.__way_points, accumulated_distance, key=_accumulated_distance
+        )
+
+    def bisect_right(self, accumulated_distance: float) -> int:
+        """
+
+        Returns the index of the first way point with an accumulated distance > accumulated_distance.
+
+        """
+
+        if self.__way_points is None:
+            return int(
+                np.searchsorted(
+                    self.__accumulated_distances, accumulated_distance, side="right"
+                )
+            )
+
+        return bisect.bisect_right(
+            self.__way_points, accumulated_distance, key=_accumulated_distance
+        )
+
+    def index_range_between(
+        self, start_distance: float, end_distance: float
+    ) -> Tuple[int, int]:
+        """
+
+        Returns the index range [start, end) of the way points with an accumulated distance
+        strictly between start_distance and end_distance (two binary searches).
+
+        """
+
+        start = self.bisect_right(start_distance)
+        end = max(start, self.bisect_left(end_distance))
+        return start, end
+
+    def way_points_between(
+        self, start_distance: float, end_distance: float
+    ) -> List[WayPoint]:
+        """
+
+        Returns the way points with an accumulated distance strictly between start_distance
+        and end_distance, see index_range_between.
+
+        """
+
+        start, end = self.index_range_between(start_distance, end_distance)
+        return self.way_points[start:end]
+
+    def index(self, way_point: WayPoint) -> int:
+        """
+
+        Returns the index of the way point in the path. Way points are compared by identity.
+        Raises a ValueError if the way point is not part of the path.
+
+        Only way points with the same accumulated distance are compared, which are found
+        by a binary search, thus the lookup is O(log n) instead of a linear scan.
+
+        """
+
+        # a columnar path has no way point objects yet, thus it can not contain way_point
+        if self.__way_points is not None and isinstance(way_point, WayPoint):
+            distance = way_point.accumulated_distance
+            index = self.bisect_left(distance)
+
+            while (
+                index < len(self.__way_points)
+                and self.__way_points[index].accumulated_distance == distance
+            ):
+                if self.__way_points[index] is way_point:
+                    return index
+                index += 1
+
+        raise ValueError("{} is not part of the path".format(way_point))
+
+    def get_closest_point_by_distance(self, accumulated_distance: float) -> WayPoint:
+        """
+
+        Returns the (first) way point whose accumulated distance is closest to accumulated_distance.
+        Raises a ValueError if the path is empty.
+
+        """
+
+        if self.number_of_waypoints == 0:
+            raise ValueError("The path does not contain any way points.")
+
+        index = self.bisect_left(accumulated_distance)
+        candidates = [
+            i for i in (index - 1, index) if 0 <= i < self.number_of_waypoints
+        ]
+        closest = min(
+            candidates,
+            key=lambda i: abs(
+                self.way_points[i].accumulated_distance - accumulated_distance
+            ),
+        )
+
+        # if several way points share the same distance, the first one is returned
+        return self.way_points[
+            self.bisect_left(self.way_points[closest].accumulated_distance)
+        ]
+
+    def __contains__(self, way_point: WayPoint) -> bool:
+        try:
+            self.index(way_point)
+            return True
+        except ValueError:
+            return False
 
     def clear(self) -> None:
         """
@@ -101,10 +322,16 @@ class Path:
 
         del self.__way_points
         self.__way_points = []
+        self.__drop_columns()
+        self.__invalidate_indices()
         self.route_name = ""
         self.__total_distance = 0.0
 
     def has_elevation_for_all_points(self) -> bool:
+        if self.__way_points is None:
+            # assume switzerland, where there is no point below 0, see Point.has_elevation
+            return bool(np.all(self.__heights > 0.0))
+
         for pt in self.__way_points:
             if not pt.point.has_elevation():
                 return False
@@ -116,17 +343,214 @@ class Path:
         return self.__total_distance
 
     @property
-    def way_points(self):
+    def way_points(self) -> List[WayPoint]:
+        if self.__way_points is None:
+            self.__materialize_way_points()
+
         return self.__way_points
 
     @property
     def number_of_waypoints(self):
+        if self.__way_points is None:
+            return len(self.__accumulated_distances)
+
         return len(self.__way_points)
 
+    @property
+    def eastings(self) -> np.ndarray:
+        """
+        LV03 eastings (the `lat` value of a Point_LV03) of all way points.
+        """
+
+        if self.__way_points is None:
+            return self.__eastings
+
+        return self.__gather(lambda wp: wp.point.to_LV03().lat)
+
+    @property
+    def northings(self) -> np.ndarray:
+        """
+        LV03 northings (the `lon` value of a Point_LV03) of all way points.
+        """
+
+        if self.__way_points is None:
+            return self.__northings
+
+        return self.__gather(lambda wp: wp.point.to_LV03().lon)
+
+    @property
+    def heights(self) -> np.ndarray:
+        if self.__way_points is None:
+            return self.__heights
+
+        return self.__gather(lambda wp: wp.point.h)
+
+    @property
+    def accumulated_distances(self) -> np.ndarray:
+        if self.__way_points is None:
+            return self.__accumulated_distances
+
+        return self.__gather(lambda wp: wp.accumulated_distance)
+
+    def _set_columns(
+        self,
+        eastings: np.ndarray,
+        northings: np.ndarray,
+        heights: np.ndarray,
+        accumulated_distances: np.ndarray,
+        names: List[str] | None = None,
+    ) -> None:
+        """
+
+        Replaces the content of the path with a read-only copy of the given columns (LV03 coordinates).
+        Use `path_from_arrays` to create a new columnar path.
+
+        """
+
+        columns = [
+            np.array(column, dtype=np.float64)
+            for column in (eastings, northings, heights, accumulated_distances)
+        ]
+
+        if any(column.shape != columns[0].shape for column in columns):
+            raise ValueError("All columns of a path must have the same length.")
+
+        if names is not None and len(names) != len(columns[0]):
+            raise ValueError("The name column must have the same length as the path.")
+
+        for column in columns:
+            column.setflags(write=False)
+
+        (
+            self.__eastings,
+            self.__northings,
+            self.__heights,
+            self.__accumulated_distances,
+        ) = columns
+        self.__names = list(names) if names is not None else None
+        self.__way_points = None
+        self.__total_distance = float(columns[3][-1]) if len(columns[3]) > 0 else 0.0
+        self.__invalidate_indices()
+
+    def __last_point(self) -> Point_LV03:
+        if self.__way_points is None:
+            return Point_LV03(
+                float(self.__eastings[-1]),
+                float(self.__northings[-1]),
+                float(self.__heights[-1]),
+            )
+
+        return self.__way_points[-1].point.to_LV03()
+
+    def __materialize_way_points(self) -> None:
+        names = (
+            self.__names
+            if self.__names is not None
+            else [None] * self.number_of_waypoints
+        )
+        self.__way_points = [
+            WayPoint(distance, Point_LV03(easting, northing, height), name)
+            for easting, northing, height, distance, name in zip(
+                self.__eastings.tolist(),
+                self.__northings.tolist(),
+                self.__heights.tolist(),
+                self.__accumulated_distances.tolist(),
+                names,
+            )
+        ]
+        self.__drop_columns()
+
+    def __drop_columns(self) -> None:
+        self.__eastings = None
+        self.__northings = None
+        self.__heights = None
+        self.__accumulated_distances = None
+        self.__names = None
+
+    def __invalidate_indices(self) -> None:
+        self.__spatial_index = None
+
+    def __gather(self, getter) -> np.ndarray:
+        return np.fromiter(
+            map(getter, self.__way_points),
+            dtype=np.float64,
+            count=len(self.__way_points),
+        )
+
     def copy(self):
-        copy_ = copy.deepcopy(self)
+        """
+
+        Returns an independent copy of the path without deep-copying any WayPoint or Point objects.
+
+        The copy is a columnar path: the columns of a columnar path are read-only and thus shared
+        with the copy, for a path with materialized way points a compact snapshot of the columns
+        is taken. Modifying the copy (e.g. by insert, remove or append) materializes a private
+        list of way points, thus the copy and the original never share WayPoint objects.
+
+        """
+
+        copy_ = Path()
+        copy_.route_name = self.route_name
+
+        if self.__way_points is None:
+            copy_.__way_points = None
+            copy_.__eastings = self.__eastings
+            copy_.__northings = self.__northings
+            copy_.__heights = self.__heights
+            copy_.__accumulated_distances = self.__accumulated_distances
+            copy_.__names = self.__names
+            copy_.__total_distance = self.__total_distance
+        else:
+            copy_._set_columns(
+                self.eastings,
+                self.northings,
+                self.heights,
+                self.accumulated_distances,
+                self.get_names(),
+            )
+
         return copy_
 
+    def subset(self, indices) -> Path:
+        """
+
+        Returns a new path with the way points at the given (ascending) indices, as if they were
+        added by `append`: the subset has no route name and a way point with the same (non-zero)
+        accumulated distance as its predecessor is skipped.
+
+        The subset of a columnar path is columnar as well, i.e. no WayPoint objects are created.
+        Otherwise, the subset contains the same WayPoint objects as the original path.
+
+        """
+
+        indices = np.asarray(indices, dtype=np.int64)
+
+        if self.__way_points is not None:
+            subset_ = Path()
+            for index in indices.tolist():
+                subset_.append(self.__way_points[index])
+            return subset_
+
+        # same as the check in append
+        distances = self.__accumulated_distances[indices]
+        keep = np.ones(len(indices), dtype=bool)
+        keep[1:] = (distances[1:] != distances[:-1]) | (distances[1:] == 0.0)
+        indices = indices[keep]
+
+        subset_ = Path()
+        subset_._set_columns(
+            self.__eastings[indices],
+            self.__northings[indices],
+            self.__heights[indices],
+            self.__accumulated_distances[indices],
+            (
+                [self.__names[index] for index in indices.tolist()]
+                if self.__names is not None
+                else None
+            ),
+        )
+        return subset_
+
     def get_filename(self):
         """
         Returns a filename safe variant of the route name.
@@ -137,50 +561,247 @@ class Path:
         return re.sub(r"[\W_]+", "-", self.route_name).strip().lower()
 
     def __str__(self) -> str:
-        return "Path: " + self.route_name + ", points: " + str(self.__way_points)
+        return "Path: " + self.route_name + ", points: " + str(self.way_points)
 
     def __repr__(self) -> str:
         return self.__str__()
 
     def to_json(self):
+        if self.__way_points is not None:
+            return {
+                "route_name": self.route_name,
+                "way_points": [wp.to_json() for wp in self.__way_points],
+            }
+
         return {
             "route_name": self.route_name,
-            "way_points": [wp.to_json() for wp in self.__way_points],
+            "way_points": [
+                {
+                    "accumulated_distance": distance,
+                    "point": {
+                        "lat": easting + 2_000_000,
+                        "lon": northing + 1_000_000,
+                        "h": height,
+                        "type": PointType.LV95,
+                    },
+                    "name": name,
+                }
+                for easting, northing, height, distance, name in zip(
+                    self.__eastings.tolist(),
+                    self.__northings.tolist(),
+                    self.__heights.tolist(),
+                    self.__accumulated_distances.tolist(),
+                    self.get_names(),
+                )
+            ],
         }
 
-    def to_polyline(self):
-        return polyline.encode(
-            list(
-                map(
-                    lambda pkt: (pkt.point.to_LV95().lat, pkt.point.to_LV95().lon),
-                    self.__way_points,
-                )
+    def to_bytes(self, compress: bool = True) -> bytes:
+        """
+
+        Returns the compact binary encoding of the path (without the route name),
+        see utils.binary_encoding for the format. Coordinates, heights and distances
+        are stored with millimetre precision.
+
+        """
+
+        return encode_columns(
+            (
+                self.eastings,
+                self.northings,
+                self.heights,
+                self.accumulated_distances,
             ),
-            0,
+            self.get_names(),
+            compress,
         )
 
-    def to_elevation_polyline(self):
-        return polyline.encode(
-            list(
-                map(
-                    lambda pkt: (pkt.accumulated_distance, pkt.point.h),
-                    self.__way_points,
-                )
-            ),
+    def fingerprint(self) -> str:
+        """
+
+        Returns a hash of the content of the path (coordinates, heights, accumulated distances,
+        names and route name). Paths with the same content have the same fingerprint,
+        independent of their storage layout.
+
+        """
+
+        digest = hashlib.blake2b(digest_size=16)
+        for column in (
+            self.eastings,
+            self.northings,
+            self.heights,
+            self.accumulated_distances,
+        ):
+            digest.update(np.ascontiguousarray(column, dtype=np.float64).tobytes())
+
+        names = [name if name else "" for name in self.get_names()]
+        digest.update(json.dumps([names, self.route_name]).encode("utf-8"))
+        return digest.hexdigest()
+
+    def to_binary_json(self):
+        """
+
+        Like to_json, but the way points are stored in the compact binary encoding (base64).
+        The result can be read with path_from_json.
+
+        """
+
+        return {
+            "route_name": self.route_name,
+            "binary": base64.b64encode(self.to_bytes()).decode("ascii"),
+        }
+
+    def to_polyline(self):
+        if self.__way_points is None:
+            return polyline_encoding.encode(
+                self.__eastings + 2_000_000, self.__northings + 1_000_000, 0
+            )
+
+        return polyline_encoding.encode(
+            self.__gather(lambda wp: wp.point.to_LV95().lat),
+            self.__gather(lambda wp: wp.point.to_LV95().lon),
             0,
         )
 
+    def to_elevation_polyline(self):
+        return polyline_encoding.encode(self.accumulated_distances, self.heights, 0)
+
     def get_names(self):
+        if self.__way_points is None:
+            if self.__names is None:
+                return [""] * self.number_of_waypoints
+            return [name if name else "" for name in self.__names]
+
         return [wp.name for wp in self.__way_points]
 
     def get_closest_point(self, point: Point) -> WayPoint:
-        return min(
-            self.__way_points,
-            key=lambda wp: wp.point.to_LV03().distance(point.to_LV03()),
-        )
+        lv03 = point.to_LV03()
+        return self.way_points[self.get_closest_indices([lv03.lat], [lv03.lon])[0]]
+
+    def get_closest_indices(self, eastings, northings) -> np.ndarray:
+        """
+
+        Returns for each of the given LV03 coordinates the index of the closest way point.
+        The spatial index used for the lookup is built on the first call and reused until
+        the path gets modified.
+
+        """
+
+        if self.number_of_waypoints == 0:
+            raise ValueError("The path does not contain any way points.")
+
+        if self.__spatial_index is None:
+            self.__spatial_index = GridIndex(self.eastings, self.northings)
+
+        return self.__spatial_index.query(eastings, northings)
+
+
+def path_from_arrays(
+    eastings: np.ndarray,
+    northings: np.ndarray,
+    heights: np.ndarray,
+    accumulated_distances: np.ndarray,
+    names: List[str] | None = None,
+    route_name: str = "",
+) -> Path:
+    """
+
+    Creates a path in the columnar layout from LV03 coordinates, heights and the
+    accumulated distances of its way points. No WayPoint objects are created until
+    the `way_points` property of the path is accessed.
+
+    """
+
+    path = Path()
+    path.route_name = route_name
+    path._set_columns(eastings, northings, heights, accumulated_distances, names)
+    return path
+
+
+def path_from_coordinates(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    heights: np.ndarray,
+    point_type: PointType = PointType.LV03,
+    route_name: str = "",
+) -> Path:
+    """
+
+    Creates a columnar path from coordinates in the given coordinate system (the `lat` and
+    `lon` values of the corresponding points). The coordinates are converted to LV03 and
+    the accumulated distances are calculated in a single pass.
+
+    """
+
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    heights = np.asarray(heights, dtype=np.float64)
+
+    if point_type == PointType.LV95:
+        xs, ys = xs - 2_000_000, ys - 1_000_000
+    elif point_type == PointType.WGS84:
+        xs, ys, _ = WGS84toLV03_array(xs, ys, heights)
+    elif point_type != PointType.LV03:
+        raise Exception("Unknown coordinate type")
+
+    path = Path()
+    path.route_name = route_name
+    path.append_coordinates(xs, ys, heights)
+    return path
+
+
+def _accumulate_distances(
+    eastings: np.ndarray,
+    northings: np.ndarray,
+    start_easting: float | None = None,
+    start_northing: float | None = None,
+    start_distance: float = 0.0,
+) -> np.ndarray:
+    """
+
+    Returns the accumulated distances along the given LV03 coordinates, starting at the given
+    point (or at the first coordinate). The distances are calculated as in Point_LV03.distance
+    and summed up in order, thus the result is identical to appending the points one by one.
+
+    """
+
+    eastings = np.asarray(eastings, dtype=np.float64)
+    northings = np.asarray(northings, dtype=np.float64)
+
+    delta_x = np.diff(
+        eastings, prepend=eastings[0] if start_easting is None else start_easting
+    )
+    delta_y = np.diff(
+        northings, prepend=northings[0] if start_northing is None else start_northing
+    )
+
+    steps = np.empty(len(eastings) + 1, dtype=np.float64)
+    steps[0] = start_distance
+    steps[1:] = np.sqrt(delta_x**2 + delta_y**2)
+    return np.cumsum(steps)[1:]
+
+
+def path_from_bytes(data: bytes, route_name: str = "") -> Path:
+    """
+
+    Decodes a path encoded with Path.to_bytes. The result is a columnar path.
+
+    """
+
+    columns, names = decode_columns(data)
+    return path_from_arrays(*columns, names=names, route_name=route_name)
 
 
 def path_from_json(json):
+    """
+
+    Creates a path from the result of Path.to_json or Path.to_binary_json.
+
+    """
+
+    if "binary" in json:
+        return path_from_bytes(base64.b64decode(json["binary"]), json["route_name"])
+
     path = Path()
     path.route_name = json["route_name"]
 
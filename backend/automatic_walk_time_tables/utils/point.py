@@ -2,6 +2,9 @@ import math
 
 from automatic_walk_time_tables.geo_processing import coord_transformation
 
+# the converter does not hold any state, thus all points can share the same instance
+_converter = coord_transformation.GPSConverter()
+
 
 class PointType:
     """
@@ -20,12 +23,76 @@ class PointType:
 
 # Abstract Base class
 class Point:
+    """
+    A point in one of the supported coordinate systems (see PointType).
+
+    Conversions into other coordinate systems are memoized: the first call of e.g. to_LV95()
+    creates the converted point, later calls return the same object. Changing the coordinates
+    or the height of a point invalidates its memoized conversions. The returned points are
+    shared, thus they must not be modified in place.
+
+    Points use __slots__ to keep the memory footprint of long routes small.
+    """
+
+    __slots__ = ("_conversions", "_lat", "_lon", "_h", "type")
+
     def __init__(self, lat: float, lon: float, h: float = -1.0) -> None:
-        self.lat = lat
-        self.lon = lon
-        self.h = h
+        self._conversions = None
+        self._lat = lat
+        self._lon = lon
+        self._h = h
         self.type = PointType.NONE
 
+    @property
+    def lat(self) -> float:
+        return self._lat
+
+    @lat.setter
+    def lat(self, lat: float) -> None:
+        self._lat = lat
+        self._conversions = None
+
+    @property
+    def lon(self) -> float:
+        return self._lon
+
+    @lon.setter
+    def lon(self, lon: float) -> None:
+        self._lon = lon
+        self._conversions = None
+
+    @property
+    def h(self) -> float:
+        return self._h
+
+    @h.setter
+    def h(self, h: float) -> None:
+        self._h = h
+        self._conversions = None
+
+    def __getstate__(self):
+        # memoized conversions are not part of the state (pickle, copy.deepcopy)
+        return self._lat, self._lon, self._h, self.type
+
+    def __setstate__(self, state):
+        self._lat, self._lon, self._h, self.type = state
+        self._conversions = None
+
+    def _memoize(self, point_type: str, conversion):
+        """
+        Returns the memoized conversion into point_type, calls conversion() on a cache miss.
+        """
+
+        if self._conversions is None:
+            self._conversions = {}
+
+        converted = self._conversions.get(point_type)
+        if converted is None:
+            converted = conversion()
+            self._conversions[point_type] = converted
+
+        return converted
+
     def to_LV03(self):
         raise Exception("Not possible on base class.")
 
@@ -58,6 +125,8 @@ class Point:
 
 
 class Point_LV95(Point):
+    __slots__ = ()
+
     def __init__(self, lat: float, lon: float, h: float = -1.0) -> None:
         super().__init__(lat, lon, h)
         self.type = PointType.LV95
@@ -72,20 +141,27 @@ class Point_LV95(Point):
 
     def to_LV03(self):
         """convert LV95 to LV03"""
+        return self._memoize(PointType.LV03, self.__to_LV03)
+
+    def __to_LV03(self):
         return Point_LV03(self.lat - 2_000_000, self.lon - 1_000_000, self.h)
 
 
 class Point_LV03(Point):
     """LV03 coordinates"""
 
+    __slots__ = ()
+
     def __init__(self, lat: float, lon: float, h: float = -1.0) -> None:
         super().__init__(lat, lon, h)
         self.type = PointType.LV03
 
     def to_WGS84(self):
         """convert LV03 to WGS84"""
-        converter = coord_transformation.GPSConverter()
-        wgs84 = converter.LV03toWGS84(self.lat, self.lon, self.h)
+        return self._memoize(PointType.WGS84, self.__to_WGS84)
+
+    def __to_WGS84(self):
+        wgs84 = _converter.LV03toWGS84(self.lat, self.lon, self.h)
         return Point_WGS84(wgs84[0], wgs84[1], wgs84[2] if self.h != -1.0 else -1.0)
 
     def to_LV03(self):
@@ -95,6 +171,9 @@ class Point_LV03(Point):
     def to_LV95(self) -> Point_LV95:
         """convert LV03 to LV95"""
 
+        return self._memoize(PointType.LV95, self.__to_LV95)
+
+    def __to_LV95(self):
         return Point_LV95(self.lat + 2_000_000, self.lon + 1_000_000, self.h)
 
     def distance(self, pkt):
@@ -107,16 +186,24 @@ class Point_LV03(Point):
 class Point_WGS84(Point):
     """WGS84 coordinates"""
 
+    __slots__ = ()
+
     def __init__(self, lat: float, lon: float, h: float = -1.0):
         super().__init__(lat, lon, h)
         self.type = PointType.WGS84
 
     def to_LV03(self):
         """convert WGS84 to LV03"""
-        converter = coord_transformation.GPSConverter()
-        lv03 = converter.WGS84toLV03(self.lat, self.lon, self.h)
+        return self._memoize(PointType.LV03, self.__to_LV03)
+
+    def __to_LV03(self):
+        lv03 = _converter.WGS84toLV03(self.lat, self.lon, self.h)
         return Point_LV03(lv03[0], lv03[1], self.h)
 
+    def to_LV95(self):
+        """convert WGS84 to LV95"""
+        return self.to_LV03().to_LV95()
+
     def to_WGS84(self):
         """convert WGS84 to WGS84"""
         return self
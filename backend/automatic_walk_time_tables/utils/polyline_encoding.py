@@ -0,0 +1,109 @@
+"""
+
+Vectorized implementation of Google's Encoded Polyline Algorithm Format.
+
+The functions operate on coordinate arrays instead of lists of tuples and produce exactly
+the same strings as the `polyline` package (including its Python 2 style rounding, i.e.
+halves are rounded away from zero).
+
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator, Tuple
+
+import numpy as np
+
+_MAX_CHUNKS = 13  # 64 bit / 5 bit per chunk
+
+
+def _py2_round(values: np.ndarray) -> np.ndarray:
+    return np.copysign(np.floor(np.abs(values) + 0.5), values).astype(np.int64)
+
+
+def encode(xs, ys, precision: int = 5) -> str:
+    """
+    Encodes the coordinates (xs[i], ys[i]) as polyline, equivalent to
+    polyline.encode(list(zip(xs, ys)), precision).
+    """
+
+    return "".join(encode_chunks([(xs, ys)], precision))
+
+
+def encode_chunks(
+    chunks: Iterable[Tuple[np.ndarray, np.ndarray]], precision: int = 5
+) -> Iterator[str]:
+    """
+    Streaming variant of encode: encodes consecutive chunks (xs, ys) of coordinates. The
+    concatenation of the returned strings is the polyline of all coordinates.
+    """
+
+    factor = 10**precision
+    previous = np.zeros((1, 2), dtype=np.int64)
+
+    for xs, ys in chunks:
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+
+        if len(xs) == 0:
+            continue
+
+        # interleave the rounded coordinates and calculate the differences of each component
+        values = np.empty((len(xs), 2), dtype=np.int64)
+        values[:, 0] = _py2_round(xs * factor)
+        values[:, 1] = _py2_round(ys * factor)
+        deltas = np.diff(values, axis=0, prepend=previous).ravel()
+        previous = values[-1:]
+
+        yield _encode_values(deltas)
+
+
+def _encode_values(deltas: np.ndarray) -> str:
+    # zig-zag encoding: non-negative values are shifted, negative values are inverted
+    deltas = (deltas << 1) ^ (deltas >> 63)
+
+    # split every value into chunks of 5 bit, starting with the least significant chunk
+    chunks = (deltas[:, None] >> (5 * np.arange(_MAX_CHUNKS))) & 0x1F
+    number_of_chunks = np.maximum(
+        1, _MAX_CHUNKS - np.argmax((chunks != 0)[:, ::-1], axis=1)
+    )
+    number_of_chunks[deltas == 0] = 1
+    width = int(number_of_chunks.max())
+    chunks = chunks[:, :width]
+
+    positions = np.arange(width)
+    used = positions < number_of_chunks[:, None]
+    continued = positions < number_of_chunks[:, None] - 1
+    chunks = chunks + 0x20 * continued + 63
+
+    return chunks[used].astype(np.uint8).tobytes().decode("ascii")
+
+
+def decode(expression: str, precision: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decodes a polyline into two coordinate arrays, equivalent to
+    polyline.decode(expression, precision).
+    """
+
+    chunks = np.frombuffer(expression.encode("ascii"), dtype=np.uint8).astype(np.int64)
+    chunks -= 63
+
+    if len(chunks) == 0:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64)
+
+    # a chunk without the continuation bit terminates a value
+    is_last = chunks < 0x20
+    ends = np.flatnonzero(is_last)
+
+    if len(ends) % 2 != 0 or not is_last[-1]:
+        raise ValueError("Invalid polyline: {}".format(expression))
+
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    shifts = 5 * (np.arange(len(chunks)) - np.repeat(starts, ends - starts + 1))
+    values = np.add.reduceat((chunks & 0x1F) << shifts, starts)
+
+    # undo the zig-zag encoding and the differences
+    values = (values >> 1) ^ -(values & 1)
+    coordinates = np.cumsum(values.reshape(-1, 2), axis=0) / float(10**precision)
+
+    return coordinates[:, 0], coordinates[:, 1]
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+
+class GridIndex:
+    """
+
+    Spatial index for nearest neighbour queries on a set of points (e.g. the way points of a path).
+
+    The points are bucketed into a uniform grid of square cells. The cells are stored column by
+    column, such that all points of a column of cells are contiguous in memory. A query searches a
+    growing window of cells around the query point until no unsearched cell can contain a closer point.
+    Queries are answered in batches (see query), nearest is a query for a single point.
+
+    Distances are calculated as in Point_LV03.distance. If several points have the same distance
+    to the query point, the point with the smallest index is returned (as `min()` would do).
+
+    """
+
+    max_distances_per_batch = 1 << 20
+    """ maximal number of distances calculated at once by a batched query """
+
+    def __init__(self, xs: np.ndarray, ys: np.ndarray) -> None:
+        self.xs = np.asarray(xs, dtype=np.float64)
+        self.ys = np.asarray(ys, dtype=np.float64)
+        self.number_of_points = len(self.xs)
+
+        if self.number_of_points == 0:
+            return
+
+        self.min_x = float(np.min(self.xs))
+        self.min_y = float(np.min(self.ys))
+        extent = max(
+            float(np.max(self.xs)) - self.min_x, float(np.max(self.ys)) - self.min_y
+        )
+
+        # about one point per cell along the longer side of the bounding box
+        cells_per_side = max(1, math.ceil(math.sqrt(self.number_of_points)))
+        self.cell_size = max(extent / cells_per_side, 1.0)
+
+        cell_x, cell_y = self.__cell_of(self.xs, self.ys)
+        self.number_of_columns = int(np.max(cell_x)) + 1
+        self.number_of_rows = int(np.max(cell_y)) + 1
+        keys = cell_x * self.number_of_rows + cell_y
+
+        # indices of the points sorted by cell (stable, thus sorted by index within a cell)
+        self.order = np.argsort(keys, kind="stable")
+        number_of_cells = self.number_of_columns * self.number_of_rows
+        self.offsets = np.zeros(number_of_cells + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys, minlength=number_of_cells), out=self.offsets[1:])
+
+    def __cell_of(self, xs, ys):
+        cell_x = np.floor((xs - self.min_x) / self.cell_size).astype(np.int64)
+        cell_y = np.floor((ys - self.min_y) / self.cell_size).astype(np.int64)
+        return cell_x, cell_y
+
+    def nearest(self, x: float, y: float) -> int:
+        """
+        Returns the index of the point closest to (x, y), or -1 if the index is empty.
+        """
+
+        return int(self.query([x], [y])[0])
+
+    def query(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+
+        Batched variant of nearest: returns the indices of the closest points for all query points.
+        All query points are searched together, window size by window size; only the query points
+        without a result are searched again with the next larger window.
+
+        """
+
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        result = np.full(len(xs), -1, dtype=np.int64)
+
+        if self.number_of_points == 0 or len(xs) == 0:
+            return result
+
+        cell_x, cell_y = self.__cell_of(xs, ys)
+        pending = np.arange(len(xs))
+
+        radius = 1
+        while len(pending) > 0:
+            x_start = np.maximum(cell_x[pending] - radius, 0)
+            x_end = np.minimum(cell_x[pending] + radius, self.number_of_columns - 1)
+            y_start = np.maximum(cell_y[pending] - radius, 0)
+            y_end = np.minimum(cell_y[pending] + radius, self.number_of_rows - 1)
+
+            covers_grid = (
+                (x_start == 0)
+                & (y_start == 0)
+                & (x_end == self.number_of_columns - 1)
+                & (y_end == self.number_of_rows - 1)
+            )
+
+            # the points of a window are one slice of self.order per column of the window
+            number_of_columns = np.where(
+                (x_start <= x_end) & (y_start <= y_end), x_end - x_start + 1, 0
+            )
+            query_of_slice = np.repeat(np.arange(len(pending)), number_of_columns)
+            columns = x_start[query_of_slice] + _ranks(number_of_columns)
+            slice_starts = self.offsets[
+                columns * self.number_of_rows + y_start[query_of_slice]
+            ]
+            slice_ends = self.offsets[
+                columns * self.number_of_rows + y_end[query_of_slice] + 1
+            ]
+
+            resolved = covers_grid.copy()
+            for chunk in self.__chunks(query_of_slice, slice_ends - slice_starts):
+                queries, closest, distances = self.__closest_in_slices(
+                    xs[pending],
+                    ys[pending],
+                    query_of_slice[chunk],
+                    slice_starts[chunk],
+                    slice_ends[chunk],
+                )
+
+                # points outside the window are at least radius * cell_size away
+                done = covers_grid[queries] | (distances < radius * self.cell_size)
+                result[pending[queries[done]]] = closest[done]
+                resolved[queries[done]] = True
+
+            pending = pending[~resolved]
+            radius *= 2
+
+        return result
+
+    def __chunks(self, query_of_slice: np.ndarray, slice_lengths: np.ndarray):
+        """
+        Splits the slices into chunks of whole queries with at most max_distances_per_batch
+        points (or a single query), limiting the memory used for the distances.
+        """
+
+        if len(query_of_slice) == 0:
+            return
+
+        # first slice of each query and the number of points up to it
+        firsts = np.flatnonzero(np.diff(query_of_slice, prepend=-1))
+        points_before = np.concatenate(([0], np.cumsum(slice_lengths)))[firsts]
+
+        start = 0
+        while start < len(firsts):
+            end = np.searchsorted(
+                points_before,
+                points_before[start] + self.max_distances_per_batch,
+                side="right",
+            )
+            end = max(int(end), start + 1)
+
+            slice_end = firsts[end] if end < len(firsts) else len(query_of_slice)
+            yield slice(firsts[start], slice_end)
+            start = end
+
+    def __closest_in_slices(self, xs, ys, query_of_slice, slice_starts, slice_ends):
+        """
+        Returns the queries with at least one point in their slices, the index of their closest
+        point and its distance.
+        """
+
+        lengths = slice_ends - slice_starts
+        query_of_candidate = np.repeat(query_of_slice, lengths)
+        candidates = self.order[np.repeat(slice_starts, lengths) + _ranks(lengths)]
+
+        distances = np.sqrt(
+            (self.xs[candidates] - xs[query_of_candidate]) ** 2
+            + (self.ys[candidates] - ys[query_of_candidate]) ** 2
+        )
+
+        if len(candidates) == 0:
+            return query_of_candidate, candidates, distances
+
+        # closest point of each query, ties are resolved in favour of the smallest index
+        starts = np.flatnonzero(np.diff(query_of_candidate, prepend=-1))
+        queries = query_of_candidate[starts]
+        closest_distances = np.minimum.reduceat(distances, starts)
+        is_closest = distances == np.repeat(
+            closest_distances, np.diff(starts, append=len(distances))
+        )
+        closest = np.minimum.reduceat(
+            np.where(is_closest, candidates, self.number_of_points), starts
+        )
+
+        return queries, closest, closest_distances
+
+
+def _ranks(lengths: np.ndarray) -> np.ndarray:
+    """
+    Concatenation of arange(length) for all lengths, e.g. [2, 3] gives [0, 1, 0, 1, 2].
+    """
+
+    total = int(np.sum(lengths))
+    starts = np.cumsum(lengths) - lengths
+    return np.arange(total) - np.repeat(starts, lengths)
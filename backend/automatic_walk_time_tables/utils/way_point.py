@@ -2,6 +2,8 @@ from automatic_walk_time_tables.utils.point import Point, point_from_json
 
 
 class WayPoint:
+    __slots__ = ("accumulated_distance", "point", "__name")
+
     def __init__(
         self, accumulated_distance: float, point: Point, name: str = None
     ) -> None:
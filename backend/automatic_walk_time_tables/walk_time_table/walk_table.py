@@ -37,8 +37,8 @@ def plot_elevation_profile(
 def _plot_elevation_profile(file_name, legend_position, path_, pois, way_points):
     # clear the plot, plot heights of exported data from SchweizMobil
     plt.clf()
-    distances = [p.accumulated_distance for p in path_.way_points]
-    heights = [p.point.h for p in path_.way_points]
+    distances = path_.accumulated_distances.tolist()
+    heights = path_.heights.tolist()
     plt.plot([d / 1_000.0 for d in distances], heights, label="Wanderweg", zorder=1)
     # resize plot area
     additional_space = log(max(heights) - min(heights)) * 25
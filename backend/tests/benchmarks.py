@@ -0,0 +1,542 @@
+"""
+
+Benchmarks of the backend, they are not run by the tests:
+
+    python tests/benchmarks.py [name ...]
+
+Without names, all benchmarks are run.
+
+"""
+
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+BENCHMARKS = {}
+
+
+def benchmark(function):
+    BENCHMARKS[function.__name__] = function
+    return function
+
+
+@benchmark
+def coord_transformation():
+    """Throughput of the vectorized conversions compared to GPSConverter."""
+
+    from automatic_walk_time_tables.geo_processing.coord_transformation import (
+        GPSConverter,
+        LV03toWGS84_array,
+        WGS84toLV03_array,
+    )
+
+    converter = GPSConverter()
+    rng = np.random.default_rng(42)
+    number_of_points = 100_000
+    latitudes = rng.uniform(45.8, 47.8, number_of_points)
+    longitudes = rng.uniform(5.9, 10.5, number_of_points)
+    heights = rng.uniform(200.0, 4500.0, number_of_points)
+
+    start = time.perf_counter()
+    for lat, lng, h in zip(latitudes, longitudes, heights):
+        converter.WGS84toLV03(lat, lng, h)
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    east, north, _ = WGS84toLV03_array(latitudes, longitudes, heights)
+    vectorized_time = time.perf_counter() - start
+
+    print(
+        "WGS84 -> LV03, {} points: scalar {:.3f} s, vectorized {:.4f} s".format(
+            number_of_points, scalar_time, vectorized_time
+        )
+    )
+
+    start = time.perf_counter()
+    for e, n, h in zip(east, north, heights):
+        converter.LV03toWGS84(e, n, h)
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    LV03toWGS84_array(east, north, heights)
+    vectorized_time = time.perf_counter() - start
+
+    print(
+        "LV03 -> WGS84, {} points: scalar {:.3f} s, vectorized {:.4f} s".format(
+            number_of_points, scalar_time, vectorized_time
+        )
+    )
+
+
+@benchmark
+def path_memory():
+    """Bytes per way point for both storage layouts of a path."""
+
+    import tracemalloc
+
+    from automatic_walk_time_tables.utils.path import path_from_arrays
+
+    for number_of_points in (1_000, 10_000, 100_000):
+        eastings = np.linspace(600_000.0, 650_000.0, number_of_points)
+        northings = np.linspace(200_000.0, 210_000.0, number_of_points)
+        heights = np.full(number_of_points, 500.0)
+        distances = np.hypot(eastings - eastings[0], northings - northings[0])
+
+        tracemalloc.start()
+        path = path_from_arrays(eastings, northings, heights, distances)
+        columnar_size, _ = tracemalloc.get_traced_memory()
+
+        path.way_points  # materialize WayPoint and Point objects
+        object_size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(
+            "{:>7} way points: columnar {:6.1f} bytes/way point, "
+            "way points {:6.1f} bytes/way point".format(
+                number_of_points,
+                columnar_size / number_of_points,
+                object_size / number_of_points,
+            )
+        )
+
+
+@benchmark
+def binary_encoding():
+    """Payload size and decode time of the store format, binary compared to the former JSON."""
+
+    import json
+
+    from automatic_walk_time_tables.utils.path import (
+        path_from_coordinates,
+        path_from_json,
+    )
+
+    rng = np.random.default_rng(42)
+
+    for number_of_points in (1_000, 100_000):
+        route = path_from_coordinates(
+            600_000 + np.cumsum(rng.normal(0, 7, number_of_points)),
+            200_000 + np.cumsum(rng.normal(0, 7, number_of_points)),
+            1_000 + np.cumsum(rng.normal(0, 2, number_of_points)),
+        )
+
+        for name, to_json in (
+            ("json", route.to_json),
+            ("binary", route.to_binary_json),
+        ):
+            start = time.perf_counter()
+            payload = json.dumps(to_json())
+            encode_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            path_from_json(json.loads(payload))
+            decode_time = time.perf_counter() - start
+
+            print(
+                "{:>7} points, {:<6}: {:>10} bytes, encoded in {:7.1f} ms, "
+                "decoded in {:7.1f} ms".format(
+                    number_of_points,
+                    name,
+                    len(payload),
+                    encode_time * 1_000,
+                    decode_time * 1_000,
+                )
+            )
+
+
+@benchmark
+def polyline_encoding():
+    """Vectorized polyline encoding compared to the polyline package, 10k points."""
+
+    import polyline
+
+    from automatic_walk_time_tables.utils import polyline_encoding
+
+    rng = np.random.default_rng(42)
+    number_of_points = 10_000
+
+    # a random walk through switzerland (LV95), similar to a resampled route
+    xs = 2_600_000 + np.cumsum(rng.normal(0, 10, number_of_points))
+    ys = 1_200_000 + np.cumsum(rng.normal(0, 10, number_of_points))
+    coordinates = list(zip(xs.tolist(), ys.tolist()))
+    expression = polyline.encode(coordinates, 0)
+
+    def measure(name, function, repetitions=20):
+        start = time.perf_counter()
+        for _ in range(repetitions):
+            function()
+        duration = (time.perf_counter() - start) / repetitions
+        print("{:<20} {:8.3f} ms".format(name, duration * 1_000))
+
+    measure("polyline.encode", lambda: polyline.encode(coordinates, 0))
+    measure("encode", lambda: polyline_encoding.encode(xs, ys, 0))
+    measure("polyline.decode", lambda: polyline.decode(expression, 0))
+    measure("decode", lambda: polyline_encoding.decode(expression, 0))
+
+
+@benchmark
+def douglas_peucker():
+    """The selection of the DouglasPeuckerTransformer on the e2e fixtures."""
+
+    from conftest import GPX_FILES
+    from automatic_walk_time_tables.path_transformers.douglas_peucker_transformer import (
+        DouglasPeuckerTransformer,
+    )
+    from automatic_walk_time_tables.path_transformers.pois_transfomer import (
+        POIsTransformer,
+    )
+    from automatic_walk_time_tables.utils.file_parser import GeoFileParser
+
+    def max_error(path_, selection) -> float:
+        """maximum elevation error of the linear interpolation between the selected points"""
+        interpolated = np.interp(
+            path_.accumulated_distances,
+            selection.accumulated_distances,
+            selection.heights,
+        )
+        return float(np.max(np.abs(interpolated - path_.heights)))
+
+    print(
+        "{:<32} {:>6} | {:>8} | {:>9} | {:>8}".format(
+            "file", "points", "selected", "error [m]", "time [s]"
+        )
+    )
+
+    for file_name in GPX_FILES:
+        with open(file_name) as file:
+            path_ = GeoFileParser(fetch_elevation=False).parse(
+                file_content=file.read(), extension="gpx"
+            )
+        transformer = DouglasPeuckerTransformer(pois=POIsTransformer().transform(path_))
+
+        start = time.perf_counter()
+        selection = transformer.douglas_peucker(path_.copy())
+        duration = time.perf_counter() - start
+
+        print(
+            "{:<32} {:>6} | {:>8} | {:>9.1f} | {:>8.3f}".format(
+                os.path.basename(file_name)[:32],
+                path_.number_of_waypoints,
+                selection.number_of_waypoints,
+                max_error(path_, selection),
+                duration,
+            )
+        )
+
+
+@benchmark
+def equidistant():
+    """Resampling a route of 40 km with 1 m, 10 m and 100 m spacings."""
+
+    from automatic_walk_time_tables.path_transformers.equidistant_transfomer import (
+        EquidistantTransformer,
+    )
+    from automatic_walk_time_tables.utils.path import path_from_coordinates
+
+    rng = np.random.default_rng(42)
+    number_of_points = 4_000
+
+    # random walk with steps of about 10 m, similar to a GPX track
+    eastings = 600_000 + np.cumsum(rng.normal(0, 7, number_of_points))
+    northings = 200_000 + np.cumsum(rng.normal(0, 7, number_of_points))
+    heights = 1_000 + np.cumsum(rng.normal(0, 1, number_of_points))
+    route = path_from_coordinates(eastings, northings, heights)
+
+    print(
+        "Route with {} points and {:.1f} km".format(
+            number_of_points, route.total_distance / 1_000
+        )
+    )
+
+    for spacing in (1, 10, 100):
+        interpolating = EquidistantTransformer(
+            equidistant_distance=spacing, interpolate=True
+        )
+        selecting = EquidistantTransformer(equidistant_distance=spacing)
+
+        start = time.perf_counter()
+        resampled = interpolating.transform(route)
+        transform_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        polyline = interpolating.to_polyline(route)
+        stream_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        selected = selecting.transform(route.copy())
+        select_time = time.perf_counter() - start
+
+        print(
+            "{:>4} m: interpolated {:>6} points in {:6.1f} ms, streamed polyline ({} bytes) "
+            "in {:6.1f} ms | selection {:>5} points in {:6.1f} ms".format(
+                spacing,
+                resampled.number_of_waypoints,
+                transform_time * 1_000,
+                len(polyline),
+                stream_time * 1_000,
+                selected.number_of_waypoints,
+                select_time * 1_000,
+            )
+        )
+
+
+@benchmark
+def simplification():
+    """Size of the status polyline of a long route before and after simplifying."""
+
+    from automatic_walk_time_tables.path_transformers.equidistant_transfomer import (
+        EquidistantTransformer,
+    )
+    from automatic_walk_time_tables.path_transformers.simplification_transformer import (
+        SimplificationTransformer,
+    )
+    from automatic_walk_time_tables.utils.path import path_from_coordinates
+
+    rng = np.random.default_rng(42)
+    number_of_points = 20_000
+
+    # random walk with steps of about 10 m and a slowly changing direction
+    directions = np.cumsum(rng.normal(0, 0.2, number_of_points))
+    eastings = 600_000 + np.cumsum(10 * np.cos(directions))
+    northings = 200_000 + np.cumsum(10 * np.sin(directions))
+    heights = 1_000 + np.cumsum(rng.normal(0, 1, number_of_points))
+    route = path_from_coordinates(eastings, northings, heights)
+
+    start = time.perf_counter()
+    resampled = EquidistantTransformer(equidistant_distance=1).to_polyline(route)
+    print(
+        "Route with {} points and {:.1f} km, 1 m polyline: {} bytes in {:.1f} ms".format(
+            number_of_points,
+            route.total_distance / 1_000,
+            len(resampled),
+            (time.perf_counter() - start) * 1_000,
+        )
+    )
+
+    for transformer in (
+        SimplificationTransformer(tolerance=1),
+        SimplificationTransformer(tolerance=5),
+        SimplificationTransformer(output_size=2_000),
+        SimplificationTransformer(output_size=500),
+    ):
+        start = time.perf_counter()
+        simplified = transformer.transform(route)
+        polyline = simplified.to_polyline()
+        print(
+            "tolerance {:6.2f} m: {:>6} points, {:>7} bytes in {:6.1f} ms".format(
+                transformer.get_tolerance(route),
+                simplified.number_of_waypoints,
+                len(polyline),
+                (time.perf_counter() - start) * 1_000,
+            )
+        )
+
+
+@benchmark
+def spatial_index():
+    """Batched nearest neighbour queries close to a route, compared to a loop over nearest."""
+
+    from automatic_walk_time_tables.utils.spatial_index import GridIndex
+
+    rng = np.random.default_rng(42)
+
+    for number_of_points in (1_000, 20_000, 100_000):
+        directions = np.cumsum(rng.normal(0, 0.3, number_of_points))
+        eastings = 600_000 + np.cumsum(10 * np.cos(directions))
+        northings = 200_000 + np.cumsum(10 * np.sin(directions))
+        query_eastings = eastings + rng.normal(0, 20, number_of_points)
+        query_northings = northings + rng.normal(0, 20, number_of_points)
+
+        index = GridIndex(eastings, northings)
+
+        start = time.perf_counter()
+        batched = index.query(query_eastings, query_northings)
+        batched_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        single = [
+            index.nearest(x, y)
+            for x, y in zip(query_eastings[:1_000], query_northings[:1_000])
+        ]
+        single_time = (time.perf_counter() - start) * number_of_points / 1_000
+
+        assert single == batched[:1_000].tolist()
+        print(
+            "{:>7} points and queries: batched {:7.1f} ms, nearest (extrapolated) {:7.1f} ms".format(
+                number_of_points, batched_time * 1_000, single_time * 1_000
+            )
+        )
+
+
+@benchmark
+def pois():
+    """Default and distance-based POIs of a route with 100k points."""
+
+    from automatic_walk_time_tables.path_transformers.pois_transfomer import (
+        POIsTransformer,
+    )
+    from automatic_walk_time_tables.utils.path import path_from_coordinates
+
+    rng = np.random.default_rng(42)
+    number_of_points = 100_000
+
+    route = path_from_coordinates(
+        600_000 + np.cumsum(rng.normal(0, 7, number_of_points)),
+        200_000 + np.cumsum(rng.normal(0, 7, number_of_points)),
+        1_000 + np.cumsum(rng.normal(0, 2, number_of_points)),
+    )
+    distance_str = ",".join(
+        str(d) for d in np.linspace(0, route.total_distance, 50).tolist()
+    )
+
+    for name, transformer in (
+        ("calc_pois", POIsTransformer()),
+        ("pois_from_distance_string", POIsTransformer(pois_distance_str=distance_str)),
+    ):
+        start = time.perf_counter()
+        for _ in range(100):
+            transformer.transform(route)
+        print(
+            "{:<26} {:.3f} ms for 100k points".format(
+                name, (time.perf_counter() - start) * 10
+            )
+        )
+
+
+@benchmark
+def elevation_providers():
+    """
+    Elevation profile of a route with 12k points from a stand-in of the profile API (with the
+    latency of the real API) and from a local DEM, see elevation_stand_ins.
+    """
+
+    import tempfile
+
+    from elevation_stand_ins import ProfileAPI, random_route, write_dem
+
+    from automatic_walk_time_tables.geo_processing.elevation_providers import (
+        LocalDEMElevationProvider,
+        RemoteElevationProvider,
+        _fetch_profile,
+    )
+
+    rng = np.random.default_rng(42)
+    eastings, northings = random_route(rng, 12_000)
+
+    api = ProfileAPI(latency=0.05)
+    remote = RemoteElevationProvider(url=api.url)
+
+    for max_workers in (1, 4):
+        _fetch_profile.cache_clear()
+        RemoteElevationProvider.max_workers = max_workers
+        api.requests_received.clear()
+
+        start = time.perf_counter()
+        profile = remote.profile(eastings, northings, 15_000)
+        print(
+            "remote, {} worker(s): {} points with {} requests in {:.0f} ms".format(
+                max_workers,
+                len(profile[0]),
+                len(api.requests_received),
+                (time.perf_counter() - start) * 1_000,
+            )
+        )
+
+    api.requests_received.clear()
+    start = time.perf_counter()
+    remote.profile(eastings, northings, 15_000)
+    print(
+        "remote, cached: {} requests in {:.0f} ms, {}".format(
+            len(api.requests_received),
+            (time.perf_counter() - start) * 1_000,
+            RemoteElevationProvider.cache_stats(),
+        )
+    )
+    api.stop()
+
+    with tempfile.TemporaryDirectory() as directory:
+        local = LocalDEMElevationProvider(write_dem(directory))
+
+        start = time.perf_counter()
+        profile = local.profile(eastings, northings, 15_000)
+        print(
+            "local: {} points in {:.1f} ms".format(
+                len(profile[0]), (time.perf_counter() - start) * 1_000
+            )
+        )
+
+        number_of_samples = 1_000_000
+        sample_eastings = rng.uniform(596_000, 604_000, number_of_samples)
+        sample_northings = rng.uniform(196_000, 204_000, number_of_samples)
+        start = time.perf_counter()
+        local.sample(sample_eastings, sample_northings)
+        print(
+            "local: {} samples in {:.0f} ms".format(
+                number_of_samples, (time.perf_counter() - start) * 1_000
+            )
+        )
+
+        del local  # closes the memory map before the directory is removed
+
+
+@benchmark
+def gpx_parser():
+    """Time and peak memory of the streaming GPX parser and of gpxpy for 200k track points."""
+
+    import tracemalloc
+
+    import gpxpy
+
+    from automatic_walk_time_tables.utils.file_parser import GeoFileParser
+
+    rng = np.random.default_rng(42)
+    number_of_points = 200_000
+    latitudes = 46.5 + np.cumsum(rng.normal(0, 1e-4, number_of_points))
+    longitudes = 7.5 + np.cumsum(rng.normal(0, 1e-4, number_of_points))
+    elevations = 1000 + np.cumsum(rng.normal(0, 1, number_of_points))
+    gpx_raw_data = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<gpx version="1.1" creator="test" xmlns="http://www.topografix.com/GPX/1/1">'
+        "<metadata><name>Route</name></metadata><trk><trkseg>{}</trkseg></trk></gpx>"
+    ).format(
+        "".join(
+            '<trkpt lat="{:.7f}" lon="{:.7f}"><ele>{:.1f}</ele>'
+            "<time>2024-06-01T08:00:00Z</time></trkpt>".format(*coordinates)
+            for coordinates in zip(latitudes, longitudes, elevations)
+        )
+    )
+    print("GPX file of {:.0f} MB".format(len(gpx_raw_data) / 1e6))
+
+    parser = GeoFileParser(fetch_elevation=False)
+    for name, parse in (
+        ("gpxpy", gpxpy.parse),
+        ("streaming", lambda data: parser.parse(file_content=data, extension="gpx")),
+    ):
+        start = time.perf_counter()
+        parse(gpx_raw_data)
+        duration = time.perf_counter() - start
+
+        # measured separately, tracing the allocations slows down the parsers
+        tracemalloc.start()
+        parse(gpx_raw_data)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            "{}: {} points in {:.0f} ms, peak memory {:.0f} MB".format(
+                name, number_of_points, duration * 1_000, peak / 1e6
+            )
+        )
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+
+    for name in sys.argv[1:] or list(BENCHMARKS):
+        print("== {}".format(name))
+        BENCHMARKS[name]()
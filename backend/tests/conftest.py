@@ -0,0 +1,50 @@
+"""
+
+Shared fixtures of the backend tests, run them from the backend folder with: python -m pytest tests
+
+The tests use the GPX files of the e2e tests (e2e/cypress/fixtures), which all contain elevation
+data, such that no elevation has to be fetched.
+
+"""
+
+import glob
+import logging
+import os
+import sys
+
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+from automatic_walk_time_tables.utils.file_parser import GeoFileParser
+
+FIXTURES = os.path.join(BACKEND, "..", "e2e", "cypress", "fixtures")
+GPX_FILES = sorted(glob.glob(os.path.join(FIXTURES, "**", "*.gpx"), recursive=True))
+
+logging.disable(logging.CRITICAL)
+
+
+def read_fixture(file_name: str) -> str:
+    with open(os.path.join(FIXTURES, file_name)) as file:
+        return file.read()
+
+
+@pytest.fixture(params=GPX_FILES, ids=os.path.basename)
+def gpx_file_name(request) -> str:
+    """The file name of a GPX file of the e2e tests (relative to FIXTURES)."""
+    return os.path.relpath(request.param, FIXTURES)
+
+
+@pytest.fixture
+def gpx_file(gpx_file_name) -> str:
+    """The content of a GPX file of the e2e tests."""
+    return read_fixture(gpx_file_name)
+
+
+@pytest.fixture
+def gpx_path(gpx_file):
+    """The path of a GPX file of the e2e tests."""
+    return GeoFileParser(fetch_elevation=False).parse(
+        file_content=gpx_file, extension="gpx"
+    )
@@ -0,0 +1,133 @@
+"""
+
+Local stand-ins for the elevation sources, used by the tests and the benchmarks:
+
+- a stand-in of the profile API: returns the vertices of the line plus evenly distributed points
+  in between (nb_points in total) with a synthetic elevation and rejects lines with more than
+  5000 points, like the real API
+- a DEM of the same (linear) elevation, thus the bilinear interpolation of the DEM is exact
+
+"""
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+
+def elevation(eastings, northings):
+    """the synthetic elevation at the given LV03 coordinates"""
+    return 500 + 0.01 * (eastings - 600_000) + 0.02 * (northings - 200_000)
+
+
+class ProfileAPI:
+    """
+    Serves the stand-in of the profile API on a free local port until stop is called.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency  # in seconds, per request
+        self.requests_received = []  # number of coordinates of each request
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                geometry = json.loads(
+                    self.rfile.read(int(self.headers["Content-Length"]))
+                )
+                query = parse_qs(urlparse(self.path).query)
+                server.requests_received.append(len(geometry["coordinates"]))
+                time.sleep(server.latency)
+
+                if len(geometry["coordinates"]) > 5000:
+                    self.respond(413, {"error": "Too many points"})
+                    return
+
+                self.respond(
+                    200,
+                    server.profile(geometry["coordinates"], int(query["nb_points"][0])),
+                )
+
+            def respond(self, status, content):
+                body = json.dumps(content).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = "http://127.0.0.1:{}/profile.json".format(self.server.server_port)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @staticmethod
+    def profile(coordinates, number_of_points):
+        xs, ys = np.asarray(coordinates, dtype=np.float64).T
+        lengths = np.concatenate(([0.0], np.cumsum(np.hypot(np.diff(xs), np.diff(ys)))))
+        fill = np.linspace(0, lengths[-1], max(number_of_points - len(xs), 0) + 2)
+        positions = np.union1d(lengths, fill[1:-1])
+        eastings = np.round(np.interp(positions, lengths, xs), 1)
+        northings = np.round(np.interp(positions, lengths, ys), 1)
+
+        return [
+            {"easting": e, "northing": n, "alts": {"COMB": round(h, 1)}}
+            for e, n, h in zip(
+                eastings.tolist(),
+                northings.tolist(),
+                elevation(eastings, northings).tolist(),
+            )
+        ]
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def write_dem(directory: str, size: float = 10_000, cell_size: float = 5.0) -> str:
+    """
+    Writes a DEM of size x size meters centered at (600000, 200000) and returns the header path.
+    """
+
+    number_of_cells = int(size / cell_size) + 1
+    header = {
+        "data": "dem.bin",
+        "dtype": "<f4",
+        "width": number_of_cells,
+        "height": number_of_cells,
+        "x_min": 2_600_000.0 - size / 2,
+        "y_max": 1_200_000.0 + size / 2,
+        "cell_size": cell_size,
+        "nodata": -9999.0,
+    }
+
+    cell_eastings = header["x_min"] - 2_000_000 + cell_size * np.arange(number_of_cells)
+    cell_northings = (
+        header["y_max"] - 1_000_000 - cell_size * np.arange(number_of_cells)
+    )
+    elevation(cell_eastings[None, :], cell_northings[:, None]).astype("<f4").tofile(
+        os.path.join(directory, header["data"])
+    )
+
+    header_path = os.path.join(directory, "dem.json")
+    with open(header_path, "w") as header_file:
+        json.dump(header, header_file)
+
+    return header_path
+
+
+def random_route(rng, number_of_points: int):
+    """LV03 eastings and northings (rounded to meters) of a random walk starting at (600000, 200000)"""
+
+    eastings = np.round(600_000 + np.cumsum(rng.normal(0, 10, number_of_points)))
+    northings = np.round(200_000 + np.cumsum(rng.normal(0, 10, number_of_points)))
+    return eastings, northings
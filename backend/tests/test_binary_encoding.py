@@ -0,0 +1,114 @@
+import struct
+
+import numpy as np
+import pytest
+
+from automatic_walk_time_tables.utils import binary_encoding
+from automatic_walk_time_tables.utils.path import (
+    Path,
+    path_from_arrays,
+    path_from_bytes,
+    path_from_json,
+)
+
+TOLERANCE = 0.0005 + 1e-9  # half a millimetre (rounding to millimetres)
+
+
+def assert_same_path(decoded: Path, original: Path):
+    assert decoded.number_of_waypoints == original.number_of_waypoints
+    for column in ("eastings", "northings", "heights", "accumulated_distances"):
+        assert np.allclose(
+            getattr(decoded, column), getattr(original, column), rtol=0, atol=TOLERANCE
+        ), column
+    assert decoded.get_names() == original.get_names()
+
+
+def named(path_: Path) -> Path:
+    names = [""] * path_.number_of_waypoints
+    names[0] = "Zürich HB"
+    names[-1] = "Sörenberg – Brienzer Rothorn ⛰"
+    return path_from_arrays(
+        path_.eastings,
+        path_.northings,
+        path_.heights,
+        path_.accumulated_distances,
+        names=names,
+        route_name=path_.route_name,
+    )
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_round_trip(gpx_path, compress):
+    data = gpx_path.to_bytes(compress=compress)
+    flags = data[5]
+
+    assert bool(flags & binary_encoding.FLAG_COMPRESSED) == compress
+    assert not flags & binary_encoding.FLAG_NAMES
+    assert_same_path(path_from_bytes(data), gpx_path)
+
+
+def test_round_trip_with_names(gpx_path):
+    path_ = named(gpx_path)
+    data = path_.to_bytes()
+
+    assert data[5] & binary_encoding.FLAG_NAMES
+    assert_same_path(path_from_bytes(data, "Route"), path_)
+    assert path_from_bytes(data, "Route").route_name == "Route"
+
+
+def test_binary_json(gpx_path):
+    path_ = named(gpx_path)
+    decoded = path_from_json(path_.to_binary_json())
+
+    assert_same_path(decoded, path_)
+    assert decoded.route_name == path_.route_name
+
+
+def test_legacy_json(gpx_path):
+    path_ = named(gpx_path)
+    decoded = path_from_json(path_.to_json())
+
+    # the way points are appended one by one, i.e. repeated distances are skipped
+    expected = path_.subset(range(path_.number_of_waypoints))
+    assert_same_path(decoded, expected)
+    assert decoded.route_name == path_.route_name
+
+
+def test_empty_path():
+    for compress in (True, False):
+        decoded = path_from_bytes(Path().to_bytes(compress=compress))
+
+        assert decoded.number_of_waypoints == 0
+        assert decoded.total_distance == 0.0
+
+
+def test_wide_deltas():
+    # a jump of more than 2^31 mm (about 2147 km) between two points
+    path_ = path_from_arrays(
+        [0.0, 2_500_000.0, 2_500_001.5],
+        [0.0, 0.0, 0.25],
+        [500.0, -1.0, 4_000.125],
+        [0.0, 2_500_000.0, 2_500_001.52],
+    )
+    data = path_.to_bytes(compress=False)
+
+    assert data[5] & binary_encoding.FLAG_WIDE_DELTAS
+    assert_same_path(path_from_bytes(data), path_)
+
+    narrow = path_from_arrays([0.0, 2_000.0], [0.0, 0.0], [1.0, 2.0], [0.0, 2_000.0])
+    assert not narrow.to_bytes()[5] & binary_encoding.FLAG_WIDE_DELTAS
+
+
+def test_invalid_data(gpx_path):
+    data = gpx_path.to_bytes()
+
+    with pytest.raises(ValueError, match="Not a binary encoded path"):
+        path_from_bytes(b"XXXX" + data[4:])
+
+    newer = bytearray(data)
+    newer[4] = binary_encoding.VERSION + 1
+    with pytest.raises(ValueError, match="Unsupported version"):
+        path_from_bytes(bytes(newer))
+
+    with pytest.raises(struct.error):
+        path_from_bytes(data[:5])
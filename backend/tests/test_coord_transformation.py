@@ -0,0 +1,45 @@
+import gpxpy
+import numpy as np
+
+from automatic_walk_time_tables.geo_processing.coord_transformation import (
+    GPSConverter,
+    LV03toWGS84_array,
+    WGS84toLV03_array,
+)
+
+
+def track_points(gpx_file):
+    gpx = gpxpy.parse(gpx_file)
+    return np.array(
+        [
+            (p.latitude, p.longitude, p.elevation)
+            for track in gpx.tracks
+            for segment in track.segments
+            for p in segment.points
+        ]
+    )
+
+
+def test_wgs84_to_lv03_matches_gps_converter(gpx_file):
+    converter = GPSConverter()
+    wgs84 = track_points(gpx_file)
+
+    expected = np.array([converter.WGS84toLV03(*p) for p in wgs84])
+    east, north, heights = WGS84toLV03_array(wgs84[:, 0], wgs84[:, 1], wgs84[:, 2])
+
+    assert np.allclose(east, expected[:, 0], rtol=0, atol=1e-6)
+    assert np.allclose(north, expected[:, 1], rtol=0, atol=1e-6)
+    assert np.allclose(heights, expected[:, 2], rtol=0, atol=1e-6)
+
+
+def test_lv03_to_wgs84_matches_gps_converter(gpx_file):
+    converter = GPSConverter()
+    wgs84 = track_points(gpx_file)
+    lv03 = np.array([converter.WGS84toLV03(*p) for p in wgs84])
+
+    expected = np.array([converter.LV03toWGS84(*p) for p in lv03])
+    lat, lng, heights = LV03toWGS84_array(lv03[:, 0], lv03[:, 1], lv03[:, 2])
+
+    assert np.allclose(lat, expected[:, 0], rtol=0, atol=1e-9)
+    assert np.allclose(lng, expected[:, 1], rtol=0, atol=1e-9)
+    assert np.allclose(heights, expected[:, 2], rtol=0, atol=1e-6)
@@ -0,0 +1,64 @@
+import json
+import os
+
+import numpy as np
+
+from automatic_walk_time_tables.path_transformers.douglas_peucker_transformer import (
+    DouglasPeuckerTransformer,
+)
+from automatic_walk_time_tables.path_transformers.pois_transfomer import POIsTransformer
+from automatic_walk_time_tables.utils.file_parser import GeoFileParser
+from automatic_walk_time_tables.utils.path import Path
+
+from conftest import read_fixture
+
+# the points selected by the original algorithm for the e2e fixtures with the default POIs,
+# as indices into the parsed path
+with open(
+    os.path.join(os.path.dirname(__file__), "data", "douglas_peucker_selections.json")
+) as file:
+    SELECTIONS = json.load(file)
+
+
+def parse_fixture(file_name: str) -> Path:
+    return GeoFileParser(fetch_elevation=False).parse(
+        file_content=read_fixture(file_name), extension="gpx"
+    )
+
+
+def test_more_pois_than_replacement_candidates():
+    # every POI replaces a selected point, the remaining points must be kept as they are
+    path_ = parse_fixture("not_tested/Seebach_Steinmaur.gpx")
+    pois = POIsTransformer(pois_distance_str="1000,2000,3000,2500,99999").transform(
+        path_
+    )
+
+    way_points = DouglasPeuckerTransformer(pois=pois).transform(path_)
+
+    assert 2 <= way_points.number_of_waypoints <= 21
+    assert way_points.accumulated_distances[0] == 0.0
+    assert way_points.total_distance == path_.total_distance
+
+
+def test_without_pois(gpx_path):
+    way_points = DouglasPeuckerTransformer(pois=Path([])).transform(gpx_path)
+
+    assert 2 <= way_points.number_of_waypoints <= 21
+    assert way_points.total_distance == gpx_path.total_distance
+
+
+def selected_indices(path_: Path, transformer: DouglasPeuckerTransformer):
+    selection = transformer.douglas_peucker(path_.copy())
+    return np.searchsorted(
+        path_.accumulated_distances, selection.accumulated_distances
+    ).tolist()
+
+
+def test_selects_the_original_points(gpx_file_name, gpx_path):
+    pois = POIsTransformer().transform(gpx_path)
+    transformer = DouglasPeuckerTransformer(pois=pois)
+
+    assert (
+        selected_indices(gpx_path, transformer)
+        == SELECTIONS[os.path.basename(gpx_file_name)]
+    )
@@ -0,0 +1,133 @@
+import numpy as np
+import pytest
+from elevation_stand_ins import ProfileAPI, elevation, random_route, write_dem
+
+from automatic_walk_time_tables.geo_processing.elevation_providers import (
+    FallbackElevationProvider,
+    LocalDEMElevationProvider,
+    RemoteElevationProvider,
+    _fetch_profile,
+)
+
+
+@pytest.fixture
+def profile_api():
+    _fetch_profile.cache_clear()
+    api = ProfileAPI()
+    yield api
+    api.stop()
+    _fetch_profile.cache_clear()
+
+
+@pytest.fixture
+def remote(profile_api):
+    return RemoteElevationProvider(url=profile_api.url)
+
+
+@pytest.fixture(scope="module")
+def local(tmp_path_factory):
+    return LocalDEMElevationProvider(write_dem(str(tmp_path_factory.mktemp("dem"))))
+
+
+@pytest.fixture(scope="module")
+def route():
+    # more than the limit of 5000 points per request of the profile API
+    return random_route(np.random.default_rng(42), 12_000)
+
+
+def vertices(eastings, northings):
+    return set(zip(eastings.tolist(), northings.tolist()))
+
+
+def test_split(remote):
+    coordinates = [(i, 0) for i in range(2_500)]
+    chunks = remote.split(coordinates, 5_000)
+
+    assert [len(chunk) for chunk, _ in chunks] == [1000, 1000, 502]
+    assert [chunk[0] for chunk, _ in chunks[1:]] == [
+        chunk[-1] for chunk, _ in chunks[:-1]
+    ]
+    assert sum(number_of_points for _, number_of_points in chunks) >= 5_000
+    assert remote.split(coordinates[:10], 100) == [(tuple(coordinates[:10]), 100)]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_remote_profile_of_a_long_route(
+    profile_api, remote, route, max_workers, monkeypatch
+):
+    monkeypatch.setattr(RemoteElevationProvider, "max_workers", max_workers)
+    eastings, northings = route
+
+    profile = remote.profile(eastings, northings, 15_000)
+
+    assert len(profile_api.requests_received) > 1
+    assert max(profile_api.requests_received) <= remote.chunk_size
+    assert vertices(eastings, northings) <= vertices(profile[0], profile[1])
+    assert np.allclose(profile[2], elevation(profile[0], profile[1]), atol=0.06)
+
+    # all points of the chunks are part of the profile, the shared vertices only once
+    chunks = remote.split(
+        list(
+            zip(eastings.astype(np.int64).tolist(), northings.astype(np.int64).tolist())
+        ),
+        15_000,
+    )
+    profile_sizes = [len(_fetch_profile(remote.url, *chunk)[0]) for chunk in chunks]
+    assert len(profile[0]) == sum(profile_sizes) - (len(chunks) - 1)
+
+
+def test_remote_profiles_are_cached(profile_api, remote, route):
+    eastings, northings = route
+    first = remote.profile(eastings, northings, 15_000)
+    number_of_requests = len(profile_api.requests_received)
+
+    second = remote.profile(eastings, northings, 15_000)
+
+    assert len(profile_api.requests_received) == number_of_requests
+    assert all(np.array_equal(a, b) for a, b in zip(first, second))
+    assert RemoteElevationProvider.cache_stats()["hits"] == len(
+        remote.split(list(zip(eastings.tolist(), northings.tolist())), 15_000)
+    )
+
+
+def test_local_profile(local, route):
+    eastings, northings = route
+    profile = local.profile(eastings, northings, 15_000)
+
+    assert vertices(eastings, northings) <= vertices(profile[0], profile[1])
+    assert np.allclose(profile[2], elevation(profile[0], profile[1]), atol=1e-3)
+
+
+def test_local_sample(local):
+    rng = np.random.default_rng(0)
+    eastings = rng.uniform(596_000, 604_000, 100_000)
+    northings = rng.uniform(196_000, 204_000, 100_000)
+
+    assert np.allclose(
+        local.sample(eastings, northings), elevation(eastings, northings), atol=1e-3
+    )
+
+    # bilinear interpolation between the cell centers, NaN outside the DEM
+    assert local.sample(np.array([600_002.5]), np.array([200_002.5]))[
+        0
+    ] == pytest.approx(elevation(600_002.5, 200_002.5), abs=1e-3)
+    assert np.isnan(local.sample(np.array([620_000.0]), np.array([200_000.0]))[0])
+
+    with pytest.raises(ValueError):
+        local.profile(np.array([600_000.0, 620_000.0]), np.array([200_000.0] * 2), 10)
+
+
+def test_fallback_to_the_profile_api(profile_api, remote, local, route):
+    eastings, northings = route
+    fallback = FallbackElevationProvider([local, remote])
+
+    inside = fallback.profile(eastings[:100], northings[:100], 100)
+    assert profile_api.requests_received == []
+    assert np.array_equal(
+        inside[2], local.profile(eastings[:100], northings[:100], 100)[2]
+    )
+
+    # a route leaving the DEM
+    outside = fallback.profile(eastings + 10_000, northings, 100)
+    assert len(profile_api.requests_received) > 0
+    assert np.allclose(outside[2], elevation(outside[0], outside[1]), atol=0.06)
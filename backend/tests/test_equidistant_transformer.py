@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from automatic_walk_time_tables.path_transformers.equidistant_transfomer import (
+    EquidistantTransformer,
+)
+
+
+def test_selection_is_the_default(gpx_path):
+    resampled = EquidistantTransformer(equidistant_distance=10).transform(gpx_path)
+
+    # a subset of the original way points, including the start and end point
+    assert np.all(
+        np.isin(resampled.accumulated_distances, gpx_path.accumulated_distances)
+    )
+    assert resampled.accumulated_distances[0] == 0.0
+    assert resampled.total_distance == gpx_path.total_distance
+    assert np.all(np.diff(resampled.accumulated_distances[:-1]) > 10)
+
+
+def select_one_by_one(path_, spacing):
+    """the selection as a loop over all way points"""
+
+    indices = [0]
+    accumulated_distance = 0
+    for index, distance in enumerate(path_.accumulated_distances.tolist()):
+        if distance - accumulated_distance > spacing:
+            indices.append(index)
+            accumulated_distance = distance
+    indices.append(path_.number_of_waypoints - 1)
+
+    return path_.subset(indices)
+
+
+@pytest.mark.parametrize("layout", ["columns", "way_points"])
+@pytest.mark.parametrize("spacing", [0, 1, 10, 100])
+def test_selection_matches_the_loop(gpx_path, layout, spacing):
+    if layout == "way_points":
+        gpx_path.way_points
+
+    selected = EquidistantTransformer(equidistant_distance=spacing).select(gpx_path)
+    expected = select_one_by_one(gpx_path, spacing)
+    expected.route_name = gpx_path.route_name
+
+    assert selected.fingerprint() == expected.fingerprint()
+
+
+@pytest.mark.parametrize("interpolate", [True, False])
+def test_to_polyline_matches_transform(gpx_path, interpolate):
+    transformer = EquidistantTransformer(
+        equidistant_distance=10, interpolate=interpolate
+    )
+
+    assert (
+        transformer.to_polyline(gpx_path)
+        == transformer.transform(gpx_path).to_polyline()
+    )
+
+
+@pytest.mark.parametrize("spacing", [1, 10, 100])
+def test_interpolation(gpx_path, spacing):
+    transformer = EquidistantTransformer(equidistant_distance=spacing, interpolate=True)
+    resampled = transformer.transform(gpx_path)
+    distances = resampled.accumulated_distances
+
+    assert np.allclose(distances[:-1], spacing * np.arange(len(distances) - 1))
+    assert distances[-1] == gpx_path.total_distance
+
+    # of several way points at the same distance, the last one is used
+    keep = np.diff(gpx_path.accumulated_distances, append=np.inf) > 0
+    assert np.allclose(
+        resampled.heights,
+        np.interp(
+            distances,
+            gpx_path.accumulated_distances[keep],
+            gpx_path.heights[keep],
+        ),
+    )
@@ -0,0 +1,135 @@
+import gpxpy
+import numpy as np
+import pytest
+
+from automatic_walk_time_tables.path_transformers.path_transfomer import PathTransformer
+from automatic_walk_time_tables.utils import path, point
+from automatic_walk_time_tables.utils.file_parser import GeoFileParser
+
+
+def parse(gpx_raw_data: str, chunk_size: int | None = None):
+    parser = GeoFileParser(fetch_elevation=False)
+    if chunk_size is not None:
+        parser.chunk_size = chunk_size
+    return parser.parse(file_content=gpx_raw_data, extension="gpx")
+
+
+def parse_with_gpxpy(gpx_raw_data: str):
+    """the former parser, returns the path and the route name"""
+
+    gpx = gpxpy.parse(gpx_raw_data)
+    segments = [
+        [(p.latitude, p.longitude, p.elevation) for p in segment.points]
+        for track in gpx.tracks
+        for segment in track.segments
+    ]
+    if len(segments) != 1:
+        raise Exception("{} tracks".format(len(segments)))
+
+    points = segments[0]
+    reference = path.path_from_coordinates(
+        [p[0] for p in points],
+        [p[1] for p in points],
+        [p[2] if p[2] is not None else -1.0 for p in points],
+        point.PointType.WGS84,
+    )
+    return reference, gpx.name if gpx.name else ""
+
+
+def track(points, version="1.1", name="<metadata><name>Route</name></metadata>"):
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<gpx version="{}" creator="test" xmlns="http://www.topografix.com/GPX/{}">'
+        "{}<wpt lat='46.0' lon='7.0'><name>Not the route</name></wpt>"
+        "<trk><name>Not the route either</name><trkseg>{}</trkseg></trk></gpx>"
+    ).format(version, version.replace(".", "/"), name, points)
+
+
+def assert_same_path(path_, reference, route_name):
+    assert path_.route_name == route_name
+    assert np.array_equal(path_.eastings, reference.eastings)
+    assert np.array_equal(path_.northings, reference.northings)
+    assert np.array_equal(path_.heights, reference.heights)
+
+
+def test_fixtures_match_gpxpy(gpx_file):
+    assert_same_path(parse(gpx_file), *parse_with_gpxpy(gpx_file))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1_000])
+def test_chunk_size_does_not_change_the_result(gpx_file, chunk_size):
+    assert parse(gpx_file, chunk_size).fingerprint() == parse(gpx_file).fingerprint()
+
+
+@pytest.mark.parametrize(
+    "gpx_raw_data",
+    [
+        track(
+            '<trkpt lat="46.1" lon="7.1"><ele>500</ele></trkpt>',
+            "1.0",
+            "<name>Old</name>",
+        ),
+        track('<trkpt lat="46.1" lon="7.1"><ele> 500 </ele></trkpt>', "1.1", ""),
+        track('<trkpt lat="46.1" lon="7.1"><ele>500</ele></trkpt>' * 3),
+    ],
+    ids=["gpx 1.0", "no name", "several points"],
+)
+def test_tracks_match_gpxpy(gpx_raw_data):
+    assert_same_path(parse(gpx_raw_data), *parse_with_gpxpy(gpx_raw_data))
+
+
+@pytest.mark.parametrize(
+    "gpx_raw_data",
+    [
+        track("</trkseg><trkseg>"),
+        track("</trkseg></trk><trk>"),
+        track("</trkseg></trk><trk><trkseg>"),
+        "<gpx version='1.1'></gpx>",
+        "<gpx version='1.1'><trk><trkseg>",
+        track('<trkpt lat="46.1"><ele>500</ele></trkpt>'),
+        track('<trkpt lat="46.1" lon="7.1"><ele>high</ele></trkpt>'),
+        "",
+    ],
+    ids=[
+        "two segments",
+        "empty track",
+        "two tracks",
+        "no track",
+        "not closed",
+        "no longitude",
+        "invalid elevation",
+        "empty",
+    ],
+)
+def test_invalid_tracks(gpx_raw_data):
+    with pytest.raises(Exception):
+        parse_with_gpxpy(gpx_raw_data)
+
+    with pytest.raises(Exception):
+        parse(gpx_raw_data)
+
+
+class HeightRecorder(PathTransformer):
+    """Records the heights of the path instead of fetching the elevation."""
+
+    def __init__(self):
+        self.heights = None
+
+    def transform(self, path_):
+        self.heights = path_.heights.tolist()
+        return path_
+
+
+def test_empty_elevations_are_missing():
+    gpx_raw_data = track(
+        '<trkpt lat="46.1" lon="7.1"><ele/></trkpt>'
+        '<trkpt lat="46.2" lon="7.2"><ele>500</ele></trkpt>'
+        '<trkpt lat="46.3" lon="7.3"><ele> </ele></trkpt>'
+        '<trkpt lat="46.4" lon="7.4"></trkpt>'
+    )
+    parser = GeoFileParser(fetch_elevation=False)
+    parser.height_fetcher = HeightRecorder()
+
+    parser.parse(file_content=gpx_raw_data, extension="gpx")
+
+    assert parser.height_fetcher.heights == [-1.0, 500.0, -1.0, -1.0]
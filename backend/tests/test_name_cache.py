@@ -0,0 +1,76 @@
+import sqlite3
+
+from automatic_walk_time_tables.utils.name_cache import NameCache
+
+
+def entry(i):
+    return {"swiss_name": "name {}".format(i), "offset": 0, "lv95_coord": [i * 10, 0]}
+
+
+def coord(i):
+    return (i * 10, 0)
+
+
+def number_of_rows(path):
+    with sqlite3.connect(path) as database:
+        return database.execute("SELECT COUNT(*) FROM names").fetchone()[0]
+
+
+def test_entries_are_read_from_disk(tmp_path):
+    path = str(tmp_path / "names.sqlite")
+    NameCache(path=path).put(coord(1), entry(1))
+
+    cache = NameCache(path=path)
+
+    assert cache.get(coord(1))["swiss_name"] == "name 1"
+    assert cache.get(coord(2)) is None
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_database_is_bounded(tmp_path):
+    path = str(tmp_path / "names.sqlite")
+    cache = NameCache(max_entries=5, path=path, max_disk_entries=10)
+
+    for i in range(100):
+        cache.put(coord(i), entry(i))
+        assert number_of_rows(path) <= 10
+
+    # the most recently stored entries are kept
+    cache = NameCache(path=path, max_disk_entries=10)
+    assert cache.get(coord(99)) is not None
+    assert cache.get(coord(0)) is None
+
+
+def test_entries_read_from_disk_are_kept(tmp_path):
+    path = str(tmp_path / "names.sqlite")
+    cache = NameCache(max_entries=0, path=path, max_disk_entries=10)
+
+    for i in range(10):
+        cache.put(coord(i), entry(i))
+    assert cache.get(coord(0)) is not None  # loaded from disk, thus recently used
+
+    for i in range(10, 15):
+        cache.put(coord(i), entry(i))
+
+    assert cache.get(coord(0)) is not None
+    assert cache.get(coord(1)) is None
+
+
+def test_database_without_last_used_column(tmp_path):
+    path = str(tmp_path / "names.sqlite")
+    with sqlite3.connect(path) as database:
+        database.execute(
+            "CREATE TABLE names (key TEXT PRIMARY KEY, entry TEXT NOT NULL)"
+        )
+        database.executemany(
+            "INSERT INTO names (key, entry) VALUES (?, ?)",
+            [("{}:0".format(i * 10), '{"lv95_coord": [0, 0]}') for i in range(20)],
+        )
+
+    cache = NameCache(path=path, max_disk_entries=10)
+
+    assert number_of_rows(path) == 9
+    assert cache.stats()["disk_entries"] == 9
+
+    cache.put(coord(100), entry(100))
+    assert NameCache(path=path).get(coord(100))["swiss_name"] == "name 100"
@@ -0,0 +1,98 @@
+import pytest
+import requests
+
+from automatic_walk_time_tables.path_transformers.naming_transformer import (
+    NamingTransformer,
+)
+
+
+class FakeResponse:
+    def __init__(self, names):
+        self.names = names
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.names
+
+
+class FakeSession:
+    """Answers like the swiss_name endpoint, or raises the error returned by fail."""
+
+    def __init__(self, fail=lambda coordinates: None):
+        self.fail = fail
+        self.requests = []
+
+    def get(self, url, json, timeout):
+        self.requests.append((len(json), timeout))
+
+        error = self.fail(json)
+        if error is not None:
+            raise error
+
+        return FakeResponse(
+            [{"offset": 0, "swiss_name": "{}".format(int(e))} for e, _ in json]
+        )
+
+
+def create_transformer(session, **attributes):
+    transformer = NamingTransformer(session=session, cache=None)
+    transformer.chunk_size = 10
+    for name, value in attributes.items():
+        setattr(transformer, name, value)
+    return transformer
+
+
+def number_of_chunks(path):
+    return -(-path.number_of_waypoints // 10)
+
+
+@pytest.fixture
+def path(gpx_path):
+    return gpx_path.subset(range(min(gpx_path.number_of_waypoints, 35)))
+
+
+def test_names_are_fetched_in_chunks(path):
+    session = FakeSession()
+    named = create_transformer(session).transform(path)
+
+    sizes = [size for size, _ in session.requests]
+    assert sizes == [
+        min(10, path.number_of_waypoints - i)
+        for i in range(0, path.number_of_waypoints, 10)
+    ]
+    assert all(way_point.name != "" for way_point in named.way_points)
+
+
+def test_failing_chunks_are_retried_point_by_point(path):
+    session = FakeSession(
+        lambda coordinates: ValueError("invalid") if len(coordinates) > 1 else None
+    )
+    named = create_transformer(session).transform(path)
+
+    assert all(way_point.name != "" for way_point in named.way_points)
+    assert len(session.requests) == number_of_chunks(path) + path.number_of_waypoints
+
+
+def test_timeouts_are_not_retried_point_by_point(path):
+    session = FakeSession(lambda coordinates: requests.exceptions.ReadTimeout())
+    named = create_transformer(session).transform(path)
+
+    assert all(way_point.name == "" for way_point in named.way_points)
+    assert len(session.requests) == number_of_chunks(path)
+
+
+def test_requests_share_the_deadline(path):
+    session = FakeSession(
+        lambda coordinates: ValueError("invalid") if len(coordinates) > 1 else None
+    )
+    named = create_transformer(session, transform_timeout=0).transform(path)
+
+    assert session.requests == []
+    assert all(way_point.name == "" for way_point in named.way_points)
+
+    session = FakeSession()
+    create_transformer(session, transform_timeout=30).transform(path)
+
+    assert all(timeout <= 30 for _, timeout in session.requests)
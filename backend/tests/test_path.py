@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from automatic_walk_time_tables.utils.point import Point_LV03
+from automatic_walk_time_tables.utils.way_point import WayPoint
+
+
+@pytest.fixture(params=["columns", "way_points"])
+def path(request, gpx_path):
+    """The path of a GPX file, as read (columns) or with materialized way points."""
+
+    if request.param == "way_points":
+        gpx_path.way_points
+    return gpx_path
+
+
+def snapshot(path_):
+    return (
+        path_.eastings.tolist(),
+        path_.northings.tolist(),
+        path_.heights.tolist(),
+        path_.accumulated_distances.tolist(),
+        path_.get_names(),
+        path_.total_distance,
+        path_.route_name,
+    )
+
+
+def modify(path_):
+    """Inserts, renames and removes way points, including the last one."""
+
+    middle = path_.way_points[path_.number_of_waypoints // 2]
+    path_.insert(
+        WayPoint(
+            middle.accumulated_distance,
+            Point_LV03(middle.point.lat + 1, middle.point.lon + 1, 1234.0),
+            "Inserted",
+        )
+    )
+    path_.way_points[0].name = "Start"
+    path_.way_points[0].point.h = 4321.0
+    path_.remove(path_.way_points[-1])
+    path_.route_name = "Modified"
+
+
+def test_modifying_the_copy_does_not_modify_the_original(path):
+    path.route_name = "Route"
+    before = snapshot(path)
+    copy = path.copy()
+
+    assert snapshot(copy) == before
+
+    modify(copy)
+
+    assert snapshot(path) == before
+    assert snapshot(copy) != before
+    assert copy.total_distance < path.total_distance
+
+
+def test_modifying_the_original_does_not_modify_the_copy(path):
+    copy = path.copy()
+    before = snapshot(copy)
+
+    modify(path)
+
+    assert snapshot(copy) == before
+    assert copy.total_distance > path.total_distance
+
+
+def test_copies_never_share_way_points(path):
+    copy = path.copy()
+
+    originals = {id(way_point) for way_point in path.way_points}
+    assert originals.isdisjoint(id(way_point) for way_point in copy.way_points)
+    assert not any(way_point in path for way_point in copy.way_points[:20])
+
+    # a copy of the copy is independent as well
+    second = copy.copy()
+    assert {id(way_point) for way_point in copy.way_points}.isdisjoint(
+        id(way_point) for way_point in second.way_points
+    )
+
+
+def test_columns_of_the_copy_are_read_only(path):
+    copy = path.copy()
+
+    for column in (copy.eastings, copy.northings, copy.heights):
+        with pytest.raises(ValueError):
+            column[0] = 0.0
+
+    assert np.array_equal(copy.accumulated_distances, path.accumulated_distances)
@@ -0,0 +1,59 @@
+from automatic_walk_time_tables.path_transformers.douglas_peucker_transformer import (
+    DouglasPeuckerTransformer,
+)
+from automatic_walk_time_tables.path_transformers.pipeline import (
+    PipelineStage,
+    TransformerPipeline,
+)
+from automatic_walk_time_tables.path_transformers.pois_transfomer import POIsTransformer
+from automatic_walk_time_tables.path_transformers.transformer_cache import (
+    TransformerCache,
+)
+
+
+def create_pipeline(cache):
+    return TransformerPipeline(
+        [
+            PipelineStage("pois", POIsTransformer(), keep_provided=True),
+            PipelineStage(
+                "way_points",
+                lambda pois: DouglasPeuckerTransformer(
+                    number_of_waypoints=21, pois=pois
+                ),
+                inputs=("pois",),
+            ),
+        ],
+        cache=cache,
+    )
+
+
+def test_results_are_reused_from_the_cache_as_copies(gpx_path):
+    cache = TransformerCache()
+
+    first = create_pipeline(cache).run(path=gpx_path.copy())
+    pipeline = create_pipeline(cache)
+    second = pipeline.run(path=gpx_path.copy())
+
+    assert [metrics.skipped for metrics in pipeline.metrics] == ["cached", "cached"]
+    for name in ("pois", "way_points"):
+        assert second[name].fingerprint() == first[name].fingerprint()
+
+    # modifying a returned path modifies neither the cache nor later results
+    for way_point in second["way_points"].way_points:
+        way_point.name = "modified"
+    third = create_pipeline(cache).run(path=gpx_path.copy())
+    assert third["way_points"].fingerprint() == first["way_points"].fingerprint()
+
+
+def test_provided_values_are_kept(gpx_path):
+    pois = POIsTransformer().transform(gpx_path)
+
+    pipeline = create_pipeline(cache=None)
+    values = pipeline.run(path=gpx_path, pois=pois)
+
+    assert values["pois"] is pois
+    assert pipeline.get_metrics("pois").skipped == "provided"
+    assert pipeline.get_metrics("way_points").skipped is None
+    assert (
+        pipeline.report()["stages"][1]["output_points"] <= 21 + pois.number_of_waypoints
+    )
@@ -0,0 +1,103 @@
+import pytest
+
+from automatic_walk_time_tables.geo_processing.coord_transformation import GPSConverter
+from automatic_walk_time_tables.utils.point import Point_LV03, Point_LV95, Point_WGS84
+
+converter = GPSConverter()
+
+
+def lv03_point():
+    return Point_LV03(600_000.0, 200_000.0, 500.0)
+
+
+def lv95_point():
+    return Point_LV95(2_600_000.0, 1_200_000.0, 500.0)
+
+
+def wgs84_point():
+    return Point_WGS84(46.95108, 7.438637, 500.0)
+
+
+def expected_lv03(point):
+    """the LV03 coordinates of a point, calculated without memoization"""
+
+    if isinstance(point, Point_LV95):
+        return point.lat - 2_000_000, point.lon - 1_000_000, point.h
+    if isinstance(point, Point_WGS84):
+        return tuple(converter.WGS84toLV03(point.lat, point.lon, point.h)[:2]) + (
+            point.h,
+        )
+    return point.lat, point.lon, point.h
+
+
+def expected_wgs84(point):
+    """the WGS84 coordinates of a point, calculated without memoization"""
+
+    if isinstance(point, Point_WGS84):
+        return point.lat, point.lon, point.h
+    return tuple(converter.LV03toWGS84(*expected_lv03(point)))
+
+
+def as_tuple(point):
+    return point.lat, point.lon, point.h
+
+
+@pytest.mark.parametrize("create", [lv03_point, lv95_point, wgs84_point])
+def test_conversions_are_memoized(create):
+    point = create()
+
+    assert point.to_LV03() is point.to_LV03()
+    assert point.to_LV95() is point.to_LV95()
+    assert point.to_WGS84() is point.to_WGS84()
+
+
+@pytest.mark.parametrize(
+    "create, step",
+    [(lv03_point, 5.0), (lv95_point, 5.0), (wgs84_point, 0.001)],
+    ids=["LV03", "LV95", "WGS84"],
+)
+@pytest.mark.parametrize("attribute", ["h", "lat", "lon"])
+def test_changes_invalidate_the_conversions(create, step, attribute):
+    point = create()
+    before = [point.to_LV03(), point.to_LV95(), point.to_WGS84()]
+
+    setattr(point, attribute, getattr(point, attribute) + step)
+    after = [point.to_LV03(), point.to_LV95(), point.to_WGS84()]
+
+    lv03 = expected_lv03(point)
+    assert as_tuple(after[0]) == pytest.approx(lv03)
+    assert as_tuple(after[1]) == pytest.approx(
+        (lv03[0] + 2_000_000, lv03[1] + 1_000_000, lv03[2])
+    )
+    assert as_tuple(after[2]) == pytest.approx(expected_wgs84(point))
+
+    # the conversions into other coordinate systems are new points
+    for old, new in zip(before, after):
+        if new is not point:
+            assert new is not old
+            assert as_tuple(new) != as_tuple(old)
+
+
+@pytest.mark.parametrize("create", [lv03_point, lv95_point])
+def test_changed_height_is_converted_to_wgs84(create):
+    point = create()
+    before = point.to_WGS84()
+
+    point.h = 1234.5
+    after = point.to_WGS84()
+
+    assert after is not before
+    assert (after.lat, after.lon) == pytest.approx((before.lat, before.lon))
+    assert after.h == pytest.approx(converter.LV03toWGS84(*expected_lv03(point))[2])
+    assert after.h != pytest.approx(before.h)
+
+
+@pytest.mark.parametrize("create", [lv03_point, lv95_point, wgs84_point])
+def test_missing_height_is_kept(create):
+    point = create()
+    point.h = -1.0
+
+    assert point.to_LV03().h == -1.0
+    assert point.to_LV95().h == -1.0
+    assert point.to_WGS84().h == -1.0
+    assert point.to_WGS84().to_LV03().h == -1.0
@@ -0,0 +1,155 @@
+import numpy as np
+import pytest
+
+from automatic_walk_time_tables.path_transformers.pois_transfomer import POIsTransformer
+from automatic_walk_time_tables.utils.path import Path, path_from_coordinates
+
+
+def calc_pois_loop(path: Path):
+    """the former loop implementation of POIsTransformer.calc_pois"""
+
+    pois = Path([])
+    pois.append(path.way_points[0])
+
+    max_index = np.argmax([p.point.h for p in path.way_points])
+    min_index = np.argmin([p.point.h for p in path.way_points])
+
+    if (
+        path.way_points[max_index].point.distance(path.way_points[0].point) >= 100
+        and path.way_points[min_index].point.distance(path.way_points[0].point) >= 100
+    ):
+        pois.insert(path.way_points[max_index])
+    if (
+        path.way_points[min_index].point.distance(path.way_points[-1].point) >= 100
+        and path.way_points[max_index].point.distance(path.way_points[-1].point) >= 100
+    ):
+        pois.insert(path.way_points[min_index])
+
+    pois.append(path.way_points[-1])
+    return pois
+
+
+def pois_from_distance_string_loop(path: Path, pois_distance_str: str):
+    """the former loop implementation of POIsTransformer.pois_from_distance_string"""
+
+    pois = Path([])
+    poi_distances = pois_distance_str.split(",")
+
+    index = 0
+    for point in path.way_points:
+        if point.accumulated_distance - int(float(poi_distances[index])) >= 0:
+            pois.append(point)
+            index += 1
+
+            if index == len(poi_distances):
+                break
+
+    return pois
+
+
+def as_tuples(path: Path):
+    return [
+        (wp.accumulated_distance, wp.point.lat, wp.point.lon, wp.point.h)
+        for wp in path.way_points
+    ]
+
+
+def random_route(rng, number_of_points):
+    steps = rng.normal(0, 7, (2, number_of_points))
+    steps[:, rng.random(number_of_points) < 0.05] = 0  # duplicated points
+    return path_from_coordinates(
+        600_000 + np.cumsum(steps[0]),
+        200_000 + np.cumsum(steps[1]),
+        1_000 + np.cumsum(rng.normal(0, 2, number_of_points)),
+    )
+
+
+def random_distance_string(rng, path: Path) -> str:
+    distances = rng.uniform(-10, path.total_distance * 1.1, rng.integers(1, 30))
+    if rng.random() < 0.5:
+        distances.sort()
+    return ",".join(str(d) for d in distances)
+
+
+def routes():
+    rng = np.random.default_rng(42)
+    for _ in range(50):
+        yield random_route(rng, int(rng.integers(2, 500)))
+
+
+@pytest.fixture(params=["columns", "objects"])
+def layout(request):
+    """Runs a test on the path as read (columns) and on a copy with way point objects."""
+
+    def as_layout(path: Path) -> Path:
+        if request.param == "objects":
+            path = path.copy()
+            path.way_points
+        return path
+
+    return as_layout
+
+
+def test_calc_pois(gpx_path, layout):
+    path = layout(gpx_path)
+
+    assert as_tuples(POIsTransformer().transform(path)) == as_tuples(
+        calc_pois_loop(path)
+    )
+
+
+def test_calc_pois_random_routes(layout):
+    for route in routes():
+        path = layout(route)
+
+        assert as_tuples(POIsTransformer().transform(path)) == as_tuples(
+            calc_pois_loop(path)
+        )
+
+
+def test_pois_from_distance_string(gpx_path, layout):
+    rng = np.random.default_rng(0)
+    path = layout(gpx_path)
+
+    for _ in range(10):
+        distance_str = random_distance_string(rng, path)
+
+        assert as_tuples(
+            POIsTransformer(pois_distance_str=distance_str).transform(path)
+        ) == as_tuples(pois_from_distance_string_loop(path, distance_str))
+
+
+def test_pois_from_distance_string_random_routes(layout):
+    rng = np.random.default_rng(1)
+
+    for route in routes():
+        path = layout(route)
+        distance_str = random_distance_string(rng, path)
+
+        assert as_tuples(
+            POIsTransformer(pois_distance_str=distance_str).transform(path)
+        ) == as_tuples(pois_from_distance_string_loop(path, distance_str))
+
+
+def test_pois_from_string(gpx_path):
+    indices = np.linspace(0, gpx_path.number_of_waypoints - 1, 5).astype(int)
+    eastings = gpx_path.eastings[indices] + 2_000_000 + 1
+    northings = gpx_path.northings[indices] + 1_000_000
+
+    # LV95 coordinates close to some way points and of a point far away from the path
+    pois_str = ";".join("{},{}".format(e, n) for e, n in zip(eastings, northings))
+    pois_str += ";2600000,1200000"
+
+    pois = POIsTransformer(pois_list_as_str=pois_str).transform(gpx_path)
+
+    # on loops, the first of several closest way points is used
+    closest = [
+        int(
+            np.argmin(
+                (gpx_path.eastings + 2_000_000 - e) ** 2
+                + (gpx_path.northings + 1_000_000 - n) ** 2
+            )
+        )
+        for e, n in zip(eastings, northings)
+    ]
+    assert as_tuples(pois) == as_tuples(gpx_path.subset(sorted(closest)))
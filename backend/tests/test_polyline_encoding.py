@@ -0,0 +1,48 @@
+import numpy as np
+import polyline
+import pytest
+
+from automatic_walk_time_tables.utils import polyline_encoding
+
+
+def test_path_polylines_match_the_polyline_package(gpx_path):
+    way_points = gpx_path.way_points
+
+    assert gpx_path.to_polyline() == polyline.encode(
+        [(wp.point.to_LV95().lat, wp.point.to_LV95().lon) for wp in way_points], 0
+    )
+    assert gpx_path.to_elevation_polyline() == polyline.encode(
+        [(wp.accumulated_distance, wp.point.h) for wp in way_points], 0
+    )
+
+
+@pytest.mark.parametrize("precision", [0, 5])
+def test_encode_and_decode_match_the_polyline_package(gpx_path, precision):
+    xs = gpx_path.eastings + 2_000_000
+    ys = gpx_path.northings + 1_000_000
+    if precision > 0:
+        xs, ys = xs / 1e5, ys / 1e5  # degree-like magnitudes
+    expected = polyline.encode(list(zip(xs.tolist(), ys.tolist())), precision)
+
+    assert polyline_encoding.encode(xs, ys, precision) == expected
+    assert (
+        "".join(
+            polyline_encoding.encode_chunks(
+                [(xs[:77], ys[:77]), (xs[77:], ys[77:])], precision
+            )
+        )
+        == expected
+    )
+    assert np.array_equal(
+        np.column_stack(polyline_encoding.decode(expected, precision)),
+        polyline.decode(expected, precision),
+    )
+
+
+def test_halves_are_rounded_away_from_zero():
+    xs = np.array([0.5, 1.5, -0.5, -2.5, 2.5])
+    ys = np.array([-1.5, 0.5, 3.5, -0.5, 0.0])
+
+    assert polyline_encoding.encode(xs, ys, 0) == polyline.encode(
+        list(zip(xs.tolist(), ys.tolist())), 0
+    )
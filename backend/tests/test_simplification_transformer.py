@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from automatic_walk_time_tables.path_transformers.simplification_transformer import (
+    SimplificationTransformer,
+)
+
+
+def max_deviations(xs, ys, selected):
+    """largest distance of the removed points to the line through the enclosing kept points"""
+
+    kept = np.flatnonzero(selected)
+    deviations = []
+    for start, end in zip(kept[:-1], kept[1:]):
+        dx, dy = xs[end] - xs[start], ys[end] - ys[start]
+        px, py = xs[start + 1 : end] - xs[start], ys[start + 1 : end] - ys[start]
+        length = np.hypot(dx, dy)
+        if length == 0:
+            deviations.append(np.max(np.hypot(px, py), initial=0.0))
+        else:
+            deviations.append(np.max(np.abs(dx * py - dy * px) / length, initial=0.0))
+
+    return max(deviations, default=0.0)
+
+
+@pytest.mark.parametrize("tolerance", [1, 10, 50])
+def test_removed_points_are_within_the_tolerance(gpx_path, tolerance):
+    transformer = SimplificationTransformer(tolerance=tolerance)
+    selected = transformer.select(gpx_path)
+    simplified = transformer.transform(gpx_path)
+
+    assert selected[0] and selected[-1]
+    assert simplified.number_of_waypoints == np.count_nonzero(selected)
+    assert simplified.accumulated_distances[0] == 0.0
+    assert simplified.total_distance == gpx_path.total_distance
+    assert (
+        max_deviations(gpx_path.eastings, gpx_path.northings, selected)
+        <= tolerance + 1e-6
+    )
+
+
+def test_output_size_tolerance_is_one_pixel(gpx_path):
+    transformer = SimplificationTransformer(output_size=500)
+    extent = max(np.ptp(gpx_path.eastings), np.ptp(gpx_path.northings))
+
+    assert transformer.get_tolerance(gpx_path) == pytest.approx(extent / 500)
+
+
+def test_from_options():
+    assert SimplificationTransformer.from_options({}) is None
+    assert (
+        SimplificationTransformer.from_options({}, output_size=2_000).output_size
+        == 2_000
+    )
+
+    transformer = SimplificationTransformer.from_options(
+        {"simplify_tolerance": "5", "simplify_output_size": 100}
+    )
+    assert transformer.tolerance == 5.0 and transformer.output_size is None
+
+    transformer = SimplificationTransformer.from_options(
+        {"simplify_output_size": "100"}, output_size=2_000
+    )
+    assert transformer.output_size == 100
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from automatic_walk_time_tables.utils.spatial_index import GridIndex
+
+
+def brute_force(xs, ys, query_xs, query_ys):
+    """index of the closest point, the smallest index on ties (as min() would do)"""
+
+    distances = np.sqrt(
+        (xs[None, :] - query_xs[:, None]) ** 2 + (ys[None, :] - query_ys[:, None]) ** 2
+    )
+    return np.argmin(distances, axis=1)
+
+
+def test_path_points_and_nearby_queries(gpx_path):
+    xs, ys = gpx_path.eastings, gpx_path.northings
+    rng = np.random.default_rng(0)
+    query_xs = np.concatenate([xs, xs + rng.normal(0, 50, len(xs))])
+    query_ys = np.concatenate([ys, ys + rng.normal(0, 50, len(ys))])
+
+    index = GridIndex(xs, ys)
+
+    assert np.array_equal(
+        index.query(query_xs, query_ys), brute_force(xs, ys, query_xs, query_ys)
+    )
+
+
+@pytest.mark.parametrize("max_distances_per_batch", [1, 10, 1 << 20])
+def test_queries_outside_of_the_grid_and_ties(max_distances_per_batch):
+    rng = np.random.default_rng(1)
+    xs = rng.uniform(0, 1_000, 500)
+    ys = rng.uniform(0, 1_000, 500)
+    xs[10:20], ys[10:20] = xs[5], ys[5]
+
+    query_xs = np.concatenate([[xs[5]], rng.uniform(-5_000, 6_000, 500)])
+    query_ys = np.concatenate([[ys[5]], rng.uniform(-5_000, 6_000, 500)])
+
+    index = GridIndex(xs, ys)
+    index.max_distances_per_batch = max_distances_per_batch
+    result = index.query(query_xs, query_ys)
+
+    assert result[0] == 5
+    assert np.array_equal(result, brute_force(xs, ys, query_xs, query_ys))
+    assert index.nearest(query_xs[1], query_ys[1]) == result[1]
+
+
+def test_empty_index():
+    index = GridIndex(np.array([]), np.array([]))
+
+    assert index.nearest(1.0, 2.0) == -1
+    assert index.query(np.array([1.0]), np.array([2.0])).tolist() == [-1]
+    assert len(GridIndex(np.array([1.0]), np.array([2.0])).query([], [])) == 0
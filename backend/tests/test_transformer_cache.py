@@ -0,0 +1,79 @@
+import numpy as np
+
+from automatic_walk_time_tables.path_transformers.transformer_cache import (
+    TransformerCache,
+)
+from automatic_walk_time_tables.utils.path import path_from_coordinates
+
+
+def straight_path(number_of_points: int):
+    """a path with the given number of way points, 10 m apart"""
+
+    eastings = 600_000 + 10.0 * np.arange(number_of_points)
+    return path_from_coordinates(
+        eastings, np.full(number_of_points, 200_000.0), np.zeros(number_of_points)
+    )
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    cache = TransformerCache(max_points=100, max_entries=2)
+    cache.put("a", straight_path(10))
+    cache.put("b", straight_path(10))
+
+    # reading "a" makes "b" the least recently used entry
+    assert cache.get("a") is not None
+    cache.put("c", straight_path(10))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+    assert stats["points"] == 20
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+
+
+def test_entries_are_evicted_until_the_points_fit():
+    cache = TransformerCache(max_points=25, max_entries=10)
+    cache.put("a", straight_path(10))
+    cache.put("b", straight_path(10))
+    cache.put("c", straight_path(20))
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 2
+    assert cache.stats()["points"] == 20
+
+    # replacing an entry does not count its points twice
+    cache.put("c", straight_path(5))
+    assert cache.stats()["points"] == 5
+    assert cache.stats()["evictions"] == 2
+
+
+def test_paths_larger_than_max_points_are_not_stored():
+    cache = TransformerCache(max_points=10, max_entries=10)
+    cache.put("small", straight_path(10))
+    cache.put("large", straight_path(11))
+
+    assert cache.get("large") is None
+    assert cache.get("small") is not None
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["points"] == 10
+    assert stats["evictions"] == 0
+
+
+def test_stored_paths_are_copies():
+    cache = TransformerCache()
+    path_ = straight_path(3)
+    cache.put("key", path_)
+    fingerprint = path_.fingerprint()
+
+    path_.way_points[1].name = "stored"
+    returned = cache.get("key")
+    returned.way_points[1].name = "returned"
+
+    assert cache.get("key").fingerprint() == fingerprint
@@ -0,0 +1,22 @@
+import copy
+import pickle
+
+from automatic_walk_time_tables.utils.point import Point_LV03
+
+
+def test_way_points_have_no_instance_dict(gpx_path):
+    way_point = gpx_path.way_points[0]
+
+    assert not hasattr(way_point, "__dict__")
+    assert not hasattr(way_point.point, "__dict__")
+
+
+def test_way_points_survive_pickle_and_deepcopy(gpx_path):
+    way_points = gpx_path.way_points[:50]
+    way_points[1].name = "Summit"
+    way_points[0].point.to_LV95()  # memoized conversions are not part of the state
+
+    for copied in (pickle.loads(pickle.dumps(way_points)), copy.deepcopy(way_points)):
+        assert [wp.to_json() for wp in copied] == [wp.to_json() for wp in way_points]
+        assert all(isinstance(wp.point, Point_LV03) for wp in copied)
+        assert copied[1].name == "Summit"